@@ -0,0 +1,326 @@
+"""Local stand-in for the SuccessFactors Learning API used by the benchmarks.
+
+Serves the OAuth token endpoint and the catalog-service / learningplan-service
+OData endpoints the tap reads (including JSON $batch and $select), backed by
+synthetic data of configurable size.
+Responses carry an ETag and If-None-Match is answered with 304.
+Optional per-request latency and random 429 injection make it possible to
+measure throughput and throttling behaviour without a live tenant.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+FEED_RE = re.compile(
+    r"/CatalogsFeed\('([^']+)'\)/(CoursesFeed|CurriculaFeed|ProgramsFeed)$"
+)
+
+
+class MockData:
+    """Deterministic synthetic catalogs.
+
+    Catalog ``i`` lists ``courses`` courses starting at course ``i * stride``,
+    so neighbouring catalogs share courses the way real tenants do.
+    """
+
+    def __init__(
+        self,
+        catalogs=50,
+        courses=200,
+        curricula=20,
+        programs=5,
+        overlap=0.5,
+        history=100,
+        todos=50,
+    ):
+        self.catalogs = catalogs
+        self.courses = courses
+        self.curricula = curricula
+        self.programs = programs
+        self.history = history
+        self.todos = todos
+        self.stride = max(1, int(courses * (1 - overlap)))
+
+    def catalog_ids(self):
+        return [f"CAT{i:05d}" for i in range(self.catalogs)]
+
+    def course(self, n, locale):
+        return {
+            "catalogID": None,
+            "criteria": None,
+            "componentID": f"COURSE{n:07d}",
+            "componentTypeID": "COURSE",
+            "revisionDate": 1600000000000 + n,
+            "title": f"Course {n} ({locale})",
+            "description": "Synthetic course " * 8,
+            "thumbnailURI": f"https://example.invalid/thumb/{n}.png",
+            "deliveryMethodID": "ONLINE",
+            "deliveryMethodDesc": "Online",
+            "totalLength": 1.5,
+            "creditHours": 1.0,
+            "cpeHours": 0.0,
+            "contactHours": 0.0,
+            "active": True,
+            "SubjectAreasFeed": [
+                {"subjectAreaID": f"SA{n % 17}", "subjectAreaDesc": f"Area {n % 17}"}
+            ],
+        }
+
+    def learning_history(self, from_date=0, to_date=None):
+        """Completions one week apart from 2012-01-01, filtered to [from, to)."""
+        records = []
+        for n in range(self.history):
+            completed = 1325376000 + n * 7 * 86400
+            if completed < from_date or (to_date is not None and completed >= to_date):
+                continue
+            records.append(
+                {
+                    "componentID": f"COURSE{n:07d}",
+                    "componentTypeID": "COURSE",
+                    "revisionDate": 1600000000000 + n,
+                    "title": f"Course {n}",
+                    "completionDate": completed * 1000,
+                    "status": "COMPLETE",
+                }
+            )
+        return records
+
+    def todo_items(self):
+        return [
+            {
+                "sku": f"SKU{n:07d}",
+                "componentID": f"COURSE{n:07d}",
+                "title": f"Course {n}",
+                "status": "ASSIGNED",
+            }
+            for n in range(self.todos)
+        ]
+
+    def feed(self, catalog_id, feed, locale):
+        index = int(catalog_id[3:])
+        if feed == "CoursesFeed":
+            start = index * self.stride
+            return [self.course(n, locale) for n in range(start, start + self.courses)]
+        if feed == "CurriculaFeed":
+            return [
+                {
+                    "curriculumID": f"CURR{index:05d}-{n}",
+                    "curriculumTitle": f"Curriculum {n}",
+                    "description": "Synthetic curriculum",
+                    "thumbnailURI": None,
+                }
+                for n in range(self.curricula)
+            ]
+        return [
+            {
+                "programID": f"PROG{index:05d}-{n}",
+                "programTitle": f"Program {n}",
+                "description": "Synthetic program",
+                "thumbnailURI": None,
+            }
+            for n in range(self.programs)
+        ]
+
+
+class MockSuccessFactorsServer(ThreadingHTTPServer):
+    """Threaded HTTP server with request counters and fault injection."""
+
+    daemon_threads = True
+
+    def __init__(self, data, latency=0.0, throttle_rate=0.0, retry_after=1, port=0):
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.data = data
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.token_expires_in = 3600
+        self.counts = Counter()
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": sum(
+                    count
+                    for endpoint, count in self.counts.items()
+                    if not endpoint.endswith("(batched)")
+                ),
+                "by_endpoint": dict(self.counts),
+                "bytes_sent": self.bytes_sent,
+            }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def _count(self, endpoint):
+        with self.server.lock:
+            self.server.counts[endpoint] += 1
+
+    def _throttled(self):
+        if self.server.throttle_rate and random.random() < self.server.throttle_rate:
+            self._count("throttled")
+            self._send_json(
+                429,
+                {"error": {"code": "429", "message": "Too many requests"}},
+                {"Retry-After": str(self.server.retry_after)},
+            )
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path.endswith("/oauth-api/rest/v1/token"):
+            self._count("token")
+            with self.server.lock:
+                token = f"mock-token-{self.server.counts['token']}"
+            self._send_json(
+                200,
+                {"access_token": token, "expires_in": self.server.token_expires_in},
+            )
+        elif self.path.endswith("/$batch"):
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            if self._throttled():
+                return
+            self._count("$batch")
+            service_root = self.path[: -len("$batch")]
+            responses = []
+            for request in json.loads(body)["requests"]:
+                status, payload = self._route(
+                    service_root + request["url"], batched=True
+                )
+                responses.append(
+                    {"id": request["id"], "status": status, "body": payload}
+                )
+            self._send_json(200, {"responses": responses})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if urlparse(self.path).path == "/__stats":
+            self._send_json(200, self.server.stats())
+            return
+        if self._throttled():
+            return
+        status, payload = self._route(self.path)
+        if status != 200:
+            self._send_json(status, payload)
+            return
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode())
+        etag = f'"{digest.hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json(status, payload, {"ETag": etag})
+
+    def _route(self, raw_path, batched=False):
+        """Return (status, payload) of a GET of raw_path.
+
+        Parts of a $batch are counted as "<endpoint> (batched)".
+        """
+        suffix = " (batched)" if batched else ""
+        url = urlparse(raw_path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        data = self.server.data
+        match = FEED_RE.search(path)
+        if path.endswith("/catalog-service/v1/Catalogs"):
+            self._count("Catalogs" + suffix)
+            records = [{"catalogID": c} for c in data.catalog_ids()]
+        elif match:
+            catalog_id, feed = match.groups()
+            self._count(feed + suffix)
+            locale = re.search(r"localeID eq '([^']*)'", query.get("$filter", [""])[0])
+            records = data.feed(catalog_id, feed, locale.group(1) if locale else "")
+        elif path.endswith("/learninghistorys"):
+            self._count("learninghistorys" + suffix)
+            criteria = dict(
+                re.findall(r"criteria/(\w+) eq (\d+)", query.get("$filter", [""])[0])
+            )
+            records = data.learning_history(
+                int(criteria.get("fromDate", 0)),
+                int(criteria["toDate"]) if "toDate" in criteria else None,
+            )
+        elif path.endswith("/UserTodoLearningItems"):
+            self._count("UserTodoLearningItems" + suffix)
+            records = data.todo_items()
+        elif path.endswith("/Scheduledofferings"):
+            self._count("Scheduledofferings" + suffix)
+            records = [
+                {"scheduleID": f"SCHED-{n}", "description": "Mock"} for n in range(2)
+            ]
+        else:
+            return 404, {"error": {"message": f"Unknown path {path}"}}
+
+        if "$top" in query:
+            top = int(query["$top"][0])
+            skip = int(query.get("$skip", ["0"])[0])
+            records = records[skip : skip + top]
+        if "$select" in query:
+            columns = query["$select"][0].split(",")
+            records = [{key: record[key] for key in columns} for record in records]
+        return 200, {"value": records}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--catalogs", type=int, default=50)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = MockSuccessFactorsServer(
+        MockData(catalogs=args.catalogs, courses=args.courses),
+        latency=args.latency_ms / 1000,
+        throttle_rate=args.throttle_rate,
+        port=args.port,
+    )
+    print(f"Serving mock SuccessFactors API on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
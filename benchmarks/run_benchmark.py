@@ -0,0 +1,156 @@
+"""Benchmark a full tap-successfactors sync against the local mock server.
+
+Example:
+
+    poetry run python benchmarks/run_benchmark.py --catalogs 200 --courses 500 \
+        --latency-ms 50 --config '{"max_workers": 8}'
+
+Reports wall time, records/sec, peak RSS of the tap process and the number
+of requests the mock server received, per endpoint.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mock_server import MockData, MockSuccessFactorsServer  # noqa: E402
+
+TAP_COMMAND = [sys.executable, "-c", "from tap_successfactors.tap import cli; cli()"]
+
+
+def build_catalog(config_path, streams):
+    """Run discovery and mark only the requested streams as selected."""
+    output = subprocess.run(
+        TAP_COMMAND + ["--config", config_path, "--discover"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    catalog = json.loads(output)
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if metadata["breadcrumb"] == []:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in streams
+    return catalog
+
+
+def run(args):
+    server = MockSuccessFactorsServer(
+        MockData(
+            catalogs=args.catalogs,
+            courses=args.courses,
+            curricula=args.curricula,
+            programs=args.programs,
+            overlap=args.overlap,
+        ),
+        latency=args.latency_ms / 1000,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    ).start()
+
+    languages = args.language.split(",")
+    config = {
+        "base_url": server.base_url,
+        "client_id": "bench",
+        "client_secret": "bench",
+        "user_id": "bench",
+        "company_id": "bench",
+        "language": languages if len(languages) > 1 else languages[0],
+        "target_user_id": "bench",
+    }
+    config.update(json.loads(args.config))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = str(Path(tmp) / "config.json")
+        Path(config_path).write_text(json.dumps(config))
+        catalog_path = str(Path(tmp) / "catalog.json")
+        catalog = build_catalog(config_path, args.streams.split(","))
+        Path(catalog_path).write_text(json.dumps(catalog))
+        requests_before = server.stats()["requests"]
+
+        records = Counter()
+        state_messages = 0
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            TAP_COMMAND + ["--config", config_path, "--catalog", catalog_path],
+            stdout=subprocess.PIPE,
+            stderr=None if args.verbose else subprocess.DEVNULL,
+            text=True,
+        )
+        for line in process.stdout:
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                records[message["stream"]] += 1
+            elif message["type"] == "STATE":
+                state_messages += 1
+        returncode = process.wait()
+        wall_time = time.perf_counter() - started
+
+    stats = server.stats()
+    server.shutdown()
+    total_records = sum(records.values())
+    return {
+        "returncode": returncode,
+        "wall_time_s": round(wall_time, 3),
+        "records": dict(records),
+        "records_per_s": round(total_records / wall_time, 1) if wall_time else None,
+        "state_messages": state_messages,
+        # ru_maxrss is reported in kilobytes on Linux.
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1
+        ),
+        "requests": stats["requests"] - requests_before,
+        "requests_by_endpoint": stats["by_endpoint"],
+        "bytes_sent": stats["bytes_sent"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--catalogs", type=int, default=50)
+    parser.add_argument("--courses", type=int, default=200, help="courses per catalog")
+    parser.add_argument("--curricula", type=int, default=20)
+    parser.add_argument("--programs", type=int, default=5)
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=0.5,
+        help="fraction of courses shared with the next catalog",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="probability of a 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument(
+        "--language", default="English", help="locale, or comma-separated locales"
+    )
+    parser.add_argument(
+        "--streams", default="catalogs", help="comma-separated streams to select"
+    )
+    parser.add_argument(
+        "--config", default="{}", help="JSON object merged into the tap config"
+    )
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show tap logs")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+    sys.exit(report["returncode"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""OAuth token handling for tap-successfactors."""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+# Refresh tokens this many seconds before the API would reject them.
+REFRESH_MARGIN = 60
+# Used when the token endpoint does not report expires_in.
+DEFAULT_EXPIRES_IN = 1800
+
+
+def token_request(
+    client_id, client_secret, base_url, user_id, company_id, userType, session=None
+) -> Tuple[str, int]:
+    """Request a new token and return it with its lifetime in seconds."""
+    auth_endpoint = "{}/learning/oauth-api/rest/v1/token".format(base_url)
+    payload = json.dumps(
+        {
+            "grant_type": "client_credentials",
+            "scope": {
+                "userId": user_id,
+                "companyId": company_id,
+                "userType": userType,
+                "resourceType": "learning_public_api",
+            },
+        }
+    )
+    response = (session or requests).request(
+        "POST",
+        auth_endpoint,
+        data=payload,
+        auth=requests.auth.HTTPBasicAuth(client_id, client_secret),
+    )
+    logging.info(f"Token created for user type: {userType}")
+    data = response.json()
+    access_token = "Bearer " + data["access_token"]
+    return access_token, int(data.get("expires_in") or DEFAULT_EXPIRES_IN)
+
+
+class TokenManager:
+    """Tap-level cache of OAuth tokens keyed by userType.
+
+    Tokens are fetched lazily on first use, refreshed shortly before they
+    expire and shared by every stream and worker thread. When ``cache_path``
+    is set, tokens are also persisted so back-to-back runs can skip the OAuth
+    round trip.
+    """
+
+    def __init__(self, config, session: requests.Session, cache_path=None):
+        self.config = config
+        self.session = session
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._issued: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._loaded = False
+
+    def _cache_key(self, user_type: str) -> str:
+        return ":".join(
+            [
+                self.config["base_url"],
+                self.config["company_id"],
+                self.config["user_id"],
+                user_type,
+            ]
+        )
+
+    def _lock(self, user_type: str) -> threading.Lock:
+        with self._locks_lock:
+            if user_type not in self._locks:
+                self._locks[user_type] = threading.Lock()
+            return self._locks[user_type]
+
+    def _load_cache(self) -> None:
+        self._loaded = True
+        if not self.cache_path or not self.cache_path.is_file():
+            return
+        try:
+            cached = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable token cache {self.cache_path}: {e}")
+            return
+        for user_type in ("admin", "user"):
+            entry = cached.get(self._cache_key(user_type))
+            if entry:
+                self._tokens[user_type] = (entry["token"], entry["expires_at"])
+                self._issued[entry["token"]] = user_type
+
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        cached = {}
+        if self.cache_path.is_file():
+            try:
+                cached = json.loads(self.cache_path.read_text())
+            except (OSError, ValueError):
+                cached = {}
+        for user_type, (token, expires_at) in list(self._tokens.items()):
+            cached[self._cache_key(user_type)] = {
+                "token": token,
+                "expires_at": expires_at,
+            }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _is_fresh(self, user_type: str) -> bool:
+        cached = self._tokens.get(user_type)
+        return cached is not None and cached[1] - REFRESH_MARGIN > time.time()
+
+    def get_token(self, user_type: str) -> str:
+        """Return a valid token for user_type, requesting one if needed."""
+        with self._locks_lock:
+            if not self._loaded:
+                self._load_cache()
+        with self._lock(user_type):
+            if not self._is_fresh(user_type):
+                token, expires_in = token_request(
+                    self.config["client_id"],
+                    self.config["client_secret"],
+                    self.config["base_url"],
+                    self.config["user_id"],
+                    self.config["company_id"],
+                    user_type,
+                    session=self.session,
+                )
+                self._tokens[user_type] = (token, time.time() + expires_in)
+                self._issued[token] = user_type
+                with self._locks_lock:
+                    self._save_cache()
+            return self._tokens[user_type][0]
+
+    def user_type_of(self, token: str) -> Optional[str]:
+        """Return the userType a token was issued for, if it came from here."""
+        return self._issued.get(token)
+
+    def invalidate(self, token: str) -> Optional[str]:
+        """Drop a token the API rejected and return its userType.
+
+        Only the exact rejected token is dropped, so concurrent requests that
+        all fail with the same expired token trigger a single refresh.
+        """
+        user_type = self.user_type_of(token)
+        if user_type is None:
+            return None
+        with self._lock(user_type):
+            cached = self._tokens.get(user_type)
+            if cached and cached[0] == token:
+                del self._tokens[user_type]
+        return user_type
@@ -0,0 +1,192 @@
+"""On-disk HTTP response cache for tap-successfactors."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+from tap_successfactors.ratelimit import AdaptiveRateLimiter, RateLimitedAdapter
+
+# Only catalog-service feeds are cached; they are large, shared across
+# catalogs and change rarely. User and token endpoints are never cached.
+CACHEABLE_PATH = "/catalog-service/"
+DEFAULT_TTL = 3600
+DEFAULT_MAX_MB = 512
+
+
+class ResponseCache:
+    """Directory of cached response bodies with a TTL and an LRU size cap.
+
+    Each entry is one file: a JSON metadata line (URL, storage time, ETag,
+    Last-Modified) followed by the raw response body. Entry mtimes are bumped
+    on every hit and the least recently used entries are evicted once the
+    directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory, ttl: int = DEFAULT_TTL, max_bytes: int = 0):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes or DEFAULT_MAX_MB * 1024 * 1024
+        self._index: Optional[Dict[Path, Tuple[int, float]]] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".cache")
+
+    def _load_index(self) -> Dict[Path, Tuple[int, float]]:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index = {}
+            for path in self.directory.glob("*.cache"):
+                stat = path.stat()
+                self._index[path] = (stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+        return self._index
+
+    def get(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        """Return (metadata, body) for key, or None if it is not cached."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            index = self._load_index()
+            now = time.time()
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                return None
+            index[path] = (index.get(path, (len(body), now))[0], now)
+        return meta, body
+
+    def is_fresh(self, meta: dict) -> bool:
+        """Return True while an entry is younger than the TTL."""
+        return time.time() - meta["stored_at"] < self.ttl
+
+    def put(self, key: str, body: bytes, headers) -> None:
+        """Store body with the validators from headers, evicting LRU entries."""
+        meta = {
+            "key": key,
+            "stored_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(body)
+        size = tmp_path.stat().st_size
+        with self._lock:
+            os.replace(tmp_path, path)
+            previous = index.get(path)
+            self._total_bytes += size - (previous[0] if previous else 0)
+            index[path] = (size, time.time())
+            if self._total_bytes > self.max_bytes:
+                self._evict(index)
+
+    def refresh(self, key: str, meta: dict, body: bytes) -> None:
+        """Restart the TTL of an entry the server confirmed is unchanged."""
+        self.put(
+            key, body, {"ETag": meta["etag"], "Last-Modified": meta["last_modified"]}
+        )
+
+    def _evict(self, index: Dict[Path, Tuple[int, float]]) -> None:
+        """Evict least recently used entries until the cache fits max_bytes.
+
+        Entries are evicted down to 90% of the cap, so the index is not
+        sorted again on every following put.
+        """
+        target = self.max_bytes * 0.9
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            del index[path]
+            self._total_bytes -= size
+
+
+class CachingAdapter(RateLimitedAdapter):
+    """HTTPAdapter that serves catalog-service GETs from a ResponseCache.
+
+    Fresh entries are returned without touching the network (or the rate
+    limiter). Stale entries are revalidated with If-None-Match and
+    If-Modified-Since, and a 304 reply is answered from the cache.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        limiter: Optional[AdaptiveRateLimiter],
+        *args,
+        **kwargs,
+    ):
+        super().__init__(limiter, *args, **kwargs)
+        self.cache = cache
+
+    def _cached_response(
+        self, request: requests.PreparedRequest, body: bytes
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json", "X-Tap-Cache": "HIT"}
+        )
+        response.encoding = "utf-8"
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request, stream=False, **kwargs):
+        if (
+            request.method != "GET"
+            or stream
+            or CACHEABLE_PATH not in urlparse(request.url).path
+        ):
+            return super().send(request, stream=stream, **kwargs)
+
+        key = unquote(request.url)
+        cached = self.cache.get(key)
+        if cached is not None:
+            meta, body = cached
+            if self.cache.is_fresh(meta):
+                if self.metrics is not None:
+                    self.metrics.record_cache_hit(request.url)
+                return self._cached_response(request, body)
+            if meta["etag"]:
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta["last_modified"]:
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(key, meta, body)
+            return self._cached_response(request, body)
+        if response.status_code == 200:
+            try:
+                self.cache.put(key, response.content, response.headers)
+            except OSError as e:
+                logging.warning(f"Could not write response cache entry: {e}")
+        return response
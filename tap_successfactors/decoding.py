@@ -0,0 +1,84 @@
+"""JSON decoding helpers for tap-successfactors."""
+
+import json
+
+from typing import Any, Iterator, Optional
+
+import requests
+
+_orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document with orjson when it is installed, else json."""
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson as _orjson
+        except ImportError:
+            _orjson = False
+    if _orjson:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def response_json(response: requests.Response) -> Any:
+    """Return the decoded body of response, decoding it at most once."""
+    try:
+        return response._decoded_json
+    except AttributeError:
+        pass
+    response._decoded_json = loads(response.content)
+    return response._decoded_json
+
+
+def batch_part_response(batch: requests.Response, part: dict) -> requests.Response:
+    """Return one part of a JSON $batch reply as a Response.
+
+    The part body is already decoded, so response_json() returns it as is.
+    """
+    response = requests.Response()
+    response.status_code = int(part.get("status", 200))
+    response.reason = ""
+    response.headers.update(part.get("headers") or {})
+    response.url = batch.url
+    response.request = batch.request
+    response._content = b""
+    response._decoded_json = part.get("body") or {}
+    return response
+
+
+class StreamedPage:
+    """OData page whose ``value`` items are decoded while the body arrives.
+
+    Iterating the page yields the records one by one from a streamed
+    response with ijson. ``next_link`` and ``count`` are only known once the
+    page has been fully iterated.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.next_link: Optional[str] = None
+        self.count = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        import ijson
+
+        raw = self.response.raw
+        raw.decode_content = True
+        builder = None
+        try:
+            for prefix, event, value in ijson.parse(raw, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == "value.item" and event == "end_map":
+                        self.count += 1
+                        yield builder.value
+                        builder = None
+                elif prefix == "value.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == "@odata.nextLink":
+                    self.next_link = value
+        finally:
+            self.response.close()
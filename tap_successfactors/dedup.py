@@ -0,0 +1,58 @@
+"""Compact in-run deduplication index for tap-successfactors."""
+
+import hashlib
+
+from array import array
+
+INITIAL_CAPACITY = 1024
+
+
+class SeenSet:
+    """Set of 64-bit key hashes kept in one open-addressing array.
+
+    Keys are hashed with BLAKE2b to 8 bytes and stored in a flat ``array``
+    that is kept between a quarter and half full, so the index costs 16 to 32
+    bytes per key instead of the few hundred a set of key tuples would. At ten
+    million keys the chance of any two colliding is below one in a million.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._slots = array("Q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        # 0 marks an empty slot.
+        return int.from_bytes(digest, "little") or 1
+
+    def _insert(self, slots: array, mask: int, value: int) -> bool:
+        i = value & mask
+        while slots[i]:
+            if slots[i] == value:
+                return False
+            i = (i + 1) & mask
+        slots[i] = value
+        return True
+
+    def add(self, key: str) -> bool:
+        """Add key and return True, or return False if it was already seen."""
+        if not self._insert(self._slots, self._mask, self._hash(key)):
+            return False
+        self._size += 1
+        if self._size * 2 > len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        capacity = len(self._slots) * 2
+        slots = array("Q", bytes(8 * capacity))
+        for value in self._slots:
+            if value:
+                self._insert(slots, capacity - 1, value)
+        self._slots = slots
+        self._mask = capacity - 1
@@ -0,0 +1,143 @@
+"""Request timing and throughput metrics for tap-successfactors."""
+
+import bisect
+import re
+import threading
+import time
+
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from urllib.parse import unquote, urlparse
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+ENDPOINT_PATTERNS = [
+    ("oauth", re.compile(r"/oauth-api/")),
+    ("batch", re.compile(r"/\$batch$")),
+    ("courses_feed", re.compile(r"/CoursesFeed")),
+    ("curricula_feed", re.compile(r"/CurriculaFeed")),
+    ("programs_feed", re.compile(r"/ProgramsFeed")),
+    ("catalogs", re.compile(r"/catalog-service/v1/Catalogs$")),
+    ("scheduled_offerings", re.compile(r"/Scheduledofferings")),
+    ("learning_historys", re.compile(r"/learninghistorys")),
+    ("user_todo_learning_items", re.compile(r"/UserTodoLearningItems")),
+]
+
+
+def endpoint_name(url: str) -> str:
+    """Return a short, stable endpoint label for a SuccessFactors URL."""
+    path = unquote(urlparse(url).path)
+    for name, pattern in ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return path.rsplit("/", 1)[-1] or path
+
+
+class EndpointStats:
+    """Latency histogram and counters of one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.throttled_or_server_errors = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "throttled_or_server_errors": self.throttled_or_server_errors,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "mean_seconds": round(self.seconds / self.requests, 4)
+            if self.requests
+            else None,
+            "max_seconds": round(self.max_seconds, 4),
+            "histogram": {
+                f"le_{bound}": count
+                for bound, count in zip(LATENCY_BUCKETS + ["inf"], self.histogram)
+            },
+        }
+
+
+class SyncMetrics:
+    """Thread-safe collector for one tap run.
+
+    The HTTP adapter reports every request, streams report the records they
+    yield and time spent decoding or transforming payloads, and the tap turns
+    the totals into a summary at the end of the sync.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.records: Dict[str, int] = defaultdict(int)
+        self.phase_seconds: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record_request(
+        self, url: str, seconds: float, status_code: int, num_bytes: int
+    ) -> None:
+        """Record one request that reached the network."""
+        with self._lock:
+            stats = self.endpoints[endpoint_name(url)]
+            stats.requests += 1
+            stats.bytes += num_bytes
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if status_code == 429 or status_code >= 500:
+                stats.throttled_or_server_errors += 1
+            elif status_code >= 400:
+                stats.errors += 1
+            self.phase_seconds["network"] += seconds
+
+    def record_retry(self, url: str) -> None:
+        """Record a request that failed and is about to be retried."""
+        with self._lock:
+            self.endpoints[endpoint_name(url)].retries += 1
+
+    def record_cache_hit(self, url: str) -> None:
+        """Record a request answered from the response cache."""
+        with self._lock:
+            self.endpoints[endpoint_name(url)].cache_hits += 1
+
+    def record_records(self, name: str, count: int) -> None:
+        """Add count to the records yielded by a stream or catalog feed."""
+        with self._lock:
+            self.records[name] += count
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the with-block to phase (e.g. "parse")."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phase_seconds[phase] += elapsed
+
+    def summary(self) -> dict:
+        """Return the run totals as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                "wall_seconds": round(time.perf_counter() - self.started, 3),
+                "phase_seconds": {
+                    phase: round(seconds, 3)
+                    for phase, seconds in self.phase_seconds.items()
+                },
+                "records": dict(self.records),
+                "endpoints": {
+                    name: stats.to_dict() for name, stats in self.endpoints.items()
+                },
+            }
@@ -0,0 +1,260 @@
+"""Concurrency helpers for tap-successfactors."""
+
+import queue
+import threading
+
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+P = TypeVar("P")
+R = TypeVar("R")
+
+DEFAULT_QUEUE_SIZE = 4
+# How often blocked queue operations check whether the pipeline was stopped.
+POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    """Exception raised in a pipeline stage, handed on to the next stage."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put item on a bounded queue, giving up once stop is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Get the next item of a queue, returning _DONE once stop is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def ordered_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int
+) -> Iterator[Tuple[T, R]]:
+    """Run func over items on a thread pool and yield (item, result) in input order.
+
+    At most ``2 * max_workers`` calls are in flight at once, so finished results
+    waiting behind a slow item stay bounded. With ``max_workers <= 1`` the calls
+    run inline on the calling thread.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, executor.submit(func, item)))
+                if len(pending) >= 2 * max_workers:
+                    done_item, future = pending.popleft()
+                    yield done_item, future.result()
+            while pending:
+                done_item, future = pending.popleft()
+                yield done_item, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def unordered_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int
+) -> Iterator[Tuple[T, R]]:
+    """Run func over items on a thread pool and yield (item, result) as each finishes.
+
+    Like ordered_map, at most ``2 * max_workers`` calls are in flight, but a
+    slow item does not hold back results that finished after it.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    remaining = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict[Future, T] = {}
+        try:
+            while True:
+                for item in remaining:
+                    pending[executor.submit(func, item)] = item
+                    if len(pending) >= 2 * max_workers:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def pipelined_map(
+    items: Iterable[T],
+    fetch: Callable[[T], Iterable[P]],
+    transform: Callable[[T, P], List[R]],
+    max_workers: int,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Iterator[Tuple[T, Optional[List[R]]]]:
+    """Fetch, transform and yield the pages of items in three overlapping stages.
+
+    ``max_workers`` fetcher threads run ``fetch`` over up to ``2 * max_workers``
+    items at once, each feeding its pages into its own queue of ``queue_size``
+    pages. One transform thread drains those queues in input order, maps every
+    page with ``transform`` and hands the rows to the caller through another
+    bounded queue. The caller receives ``(item, rows)`` for every page,
+    followed by ``(item, None)`` once all pages of item have been yielded.
+
+    All queues are bounded, so a slow consumer stalls the transform thread and
+    then the fetchers instead of letting pages pile up in memory. An exception
+    in any stage is re-raised in the caller, and closing the generator stops
+    every stage.
+    """
+    max_workers = max(max_workers, 1)
+    stop = threading.Event()
+    output: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    def run_fetch(pages: queue.Queue, item: T) -> None:
+        if stop.is_set():
+            return
+        try:
+            for page in fetch(item):
+                if not _put(pages, page, stop):
+                    return
+            _put(pages, _DONE, stop)
+        except Exception as e:
+            _put(pages, _Failure(e), stop)
+
+    def run_transform(executor: ThreadPoolExecutor) -> None:
+        try:
+            remaining = iter(items)
+            in_flight: deque = deque()
+
+            def submit_next() -> None:
+                for item in remaining:
+                    pages: queue.Queue = queue.Queue(maxsize=queue_size)
+                    executor.submit(run_fetch, pages, item)
+                    in_flight.append((item, pages))
+                    return
+
+            for _ in range(2 * max_workers):
+                submit_next()
+            while in_flight:
+                item, pages = in_flight.popleft()
+                while True:
+                    page = _get(pages, stop)
+                    if page is _DONE:
+                        break
+                    if isinstance(page, _Failure):
+                        raise page.error
+                    if not _put(output, (item, transform(item, page)), stop):
+                        return
+                if stop.is_set() or not _put(output, (item, None), stop):
+                    return
+                submit_next()
+            _put(output, _DONE, stop)
+        except Exception as e:
+            _put(output, _Failure(e), stop)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        transformer = threading.Thread(
+            target=run_transform, args=(executor,), daemon=True
+        )
+        transformer.start()
+        try:
+            while True:
+                result = output.get()
+                if result is _DONE:
+                    return
+                if isinstance(result, _Failure):
+                    raise result.error
+                yield result
+        finally:
+            stop.set()
+            transformer.join()
+
+
+class FanOutScheduler:
+    """Fetch child-stream contexts ahead of the SDK on a bounded thread pool.
+
+    Parent streams ``schedule`` every child context as soon as a page of parent
+    records is parsed, and ``claim`` it before syncing the child so a context
+    shared by several parents (a course listed in many catalogs) is synced
+    once. The child then ``take``s the prefetched result. At most
+    ``2 * max_workers`` results are fetched ahead of the one being emitted.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(max_workers, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: "OrderedDict[Hashable, Callable[[], Any]]" = OrderedDict()
+        self._futures: Dict[Hashable, Future] = {}
+        self._claimed: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def _fill(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        while self._pending and len(self._futures) < 2 * self.max_workers:
+            key, func = self._pending.popitem(last=False)
+            self._futures[key] = self._executor.submit(func)
+
+    def schedule(self, key: Hashable, func: Callable[[], Any]) -> None:
+        """Queue func to prefetch the result for key, unless key is known."""
+        if self.max_workers <= 1:
+            return
+        with self._lock:
+            if key in self._claimed or key in self._futures or key in self._pending:
+                return
+            self._pending[key] = func
+            self._fill()
+
+    def claim(self, key: Hashable) -> bool:
+        """Return True the first time key is claimed and False afterwards."""
+        with self._lock:
+            if key in self._claimed:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def take(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return the prefetched result for key, or call func if none is queued."""
+        with self._lock:
+            future = self._futures.pop(key, None)
+            self._pending.pop(key, None)
+            if self._pending:
+                self._fill()
+        if future is None:
+            return func()
+        return future.result()
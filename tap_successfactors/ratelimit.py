@@ -0,0 +1,134 @@
+"""Adaptive client-side rate limiting for tap-successfactors."""
+
+import email.utils
+import threading
+import time
+
+from collections import deque
+from http import HTTPStatus
+from typing import Optional
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+MIN_RATE = 0.5
+# Multiplicative decrease on throttling, additive increase on success.
+DECREASE_FACTOR = 0.5
+INCREASE_STEP = 0.05
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds described by a Retry-After header."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by every request the tap sends.
+
+    Without ``max_rate`` requests are not limited until the API returns a
+    429; the rate then starts at half the rate of the last second. A 429
+    halves the rate and, when the response carries Retry-After, pauses all
+    callers until it has passed; every successful response raises the rate
+    again by a small step, up to ``max_rate`` when it is set.
+    """
+
+    def __init__(self, max_rate: Optional[float] = None):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self._step = max_rate * INCREASE_STEP if max_rate else None
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Send times of the last second while the rate is not yet known.
+        self._recent: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                if self.rate is None:
+                    if wait <= 0:
+                        self._recent.append(now)
+                        while self._recent[0] < now - 1:
+                            self._recent.popleft()
+                        return
+                else:
+                    capacity = max(1.0, self.rate)
+                    self._tokens = min(
+                        capacity, self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                    if wait <= 0 and self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = max(wait, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def on_response(self, response: requests.Response) -> None:
+        """Adapt the rate to the status and Retry-After of a response."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        with self._lock:
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                if self.rate is None:
+                    self.rate = max(1.0, float(len(self._recent)))
+                    self._step = self.rate * INCREASE_STEP
+                    self._recent.clear()
+                    self._updated = time.monotonic()
+                self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+            elif (
+                self.rate is not None
+                and response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+            ):
+                self.rate = min(self.max_rate or float("inf"), self.rate + self._step)
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request through an AdaptiveRateLimiter.
+
+    When ``metrics`` is set, each request is also reported to it with its
+    latency (excluding time spent waiting on the limiter) and body size.
+    """
+
+    metrics = None
+
+    def __init__(self, limiter: Optional[AdaptiveRateLimiter], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    def send(self, request, *args, **kwargs):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        started = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        if self.limiter is not None:
+            self.limiter.on_response(response)
+        if self.metrics is not None:
+            num_bytes = 0
+            if not kwargs.get("stream"):
+                num_bytes = len(response.content)
+            self.metrics.record_request(
+                request.url,
+                time.perf_counter() - started,
+                response.status_code,
+                num_bytes,
+            )
+        return response
@@ -0,0 +1,43 @@
+"""HTTP session helpers for tap-successfactors."""
+
+import requests
+
+from typing import Optional
+
+from tap_successfactors.cache import CachingAdapter, ResponseCache
+from tap_successfactors.metrics import SyncMetrics
+from tap_successfactors.ratelimit import AdaptiveRateLimiter, RateLimitedAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+
+def build_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    metrics: Optional[SyncMetrics] = None,
+) -> requests.Session:
+    """Return a keep-alive session with a connection pool of ``pool_size``.
+
+    One session is shared by token requests and every stream so TCP and TLS
+    connections to the SuccessFactors datacenter are reused across calls.
+    When a cache is given, catalog-service responses are served through it,
+    and every request that reaches the network passes through the limiter
+    and is reported to metrics.
+    """
+    session = requests.Session()
+    if cache is not None:
+        adapter = CachingAdapter(
+            cache, limiter, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    else:
+        adapter = RateLimitedAdapter(
+            limiter, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    adapter.metrics = metrics
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    )
+    return session
@@ -1,96 +1,167 @@
 """Stream class for tap-successfactors."""
 
+import backoff
+import copy
 import datetime
 import logging
-import pandas as pd
 import requests
-import json
+import singer
+import sys
 import time
 import urllib.parse
 
+from singer import StateMessage
+
 from http import HTTPStatus
 from pathlib import Path
 from singer_sdk.exceptions import RetriableAPIError, FatalAPIError
 from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.streams import RESTStream
 from singer_sdk import typing as th
-from typing import Optional, Dict, Any, Iterable
-from urllib.parse import urlparse
+from typing import Optional, Dict, Any, Iterable, List
+from urllib.parse import urljoin, urlparse
+
+from tap_successfactors.dedup import SeenSet
+from tap_successfactors.decoding import (
+    StreamedPage,
+    batch_part_response,
+    response_json,
+)
+from tap_successfactors.metrics import SyncMetrics
+from tap_successfactors.pipeline import (
+    DEFAULT_QUEUE_SIZE,
+    FanOutScheduler,
+    ordered_map,
+    pipelined_map,
+    unordered_map,
+)
 
 logging.basicConfig(level=logging.INFO)
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
-
-
-def token_request(client_id, client_secret, base_url, user_id, company_id, userType):
-    auth_endpoint = "{}/learning/oauth-api/rest/v1/token".format(base_url)
-    payload = json.dumps(
-        {
-            "grant_type": "client_credentials",
-            "scope": {
-                "userId": user_id,
-                "companyId": company_id,
-                "userType": userType,
-                "resourceType": "learning_public_api",
-            },
-        }
-    )
-    response = requests.request(
-        "POST",
-        auth_endpoint,
-        data=payload,
-        auth=requests.auth.HTTPBasicAuth(client_id, client_secret),
-    )
-    logging.info(f"Token created for user type: {userType}")
-    access_token = "Bearer " + response.json()["access_token"]
-    return access_token
+CATALOG_SERVICE_PATH = "/learning/odatav4/public/admin/catalog-service/v1"
+# Minimum seconds between learning history checkpoints when several users are
+# extracted, since every STATE message carries all of their bookmarks.
+CHECKPOINT_SECONDS = 10
+# Records of a streamed feed page handed to the transform stage at a time.
+STREAM_CHUNK_SIZE = 100
 
 
 class TapSuccessFactorsStream(RESTStream):
     """Generic SuccessFactors stream class."""
 
+    # Streams synced when no catalog is given; the others must be selected.
+    selected_by_default = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.columns = [
-            "Feed",
-            "ID",
-            "Title",
-            "Description",
-            "thumbnailURI",
-            "typeID",
-            "revisionDate",
-            "deliveryMethodID",
-            "deliveryMethodDesc",
-            "totalLength",
-            "creditHours",
-            "cpeHours",
-            "active",
-            "subjectAreaID",
-            "subjectAreaDesc",
-        ]
+        # Streams are also built for --about and --discover, which must work
+        # without a complete config and without touching the network.
+        language = self.config.get("language") or []
+        self.languages = [language] if isinstance(language, str) else list(language)
+        if len(self.languages) > 1 and "localeID" in self.schema["properties"]:
+            self.primary_keys = list(self.primary_keys or []) + ["localeID"]
 
-        self.results_df = pd.DataFrame(columns=self.columns)
-
-        self.language = self.config["language"]
-        self.target_user_id = self.config["target_user_id"]
-        if not hasattr(self, "admin_token"):
-            self.admin_token = token_request(
-                self.config["client_id"],
-                self.config["client_secret"],
-                self.config["base_url"],
-                self.config["user_id"],
-                self.config["company_id"],
-                "admin",
-            )
-        if not hasattr(self, "user_token"):
-            self.user_token = token_request(
-                self.config["client_id"],
-                self.config["client_secret"],
-                self.config["base_url"],
-                self.config["user_id"],
-                self.config["company_id"],
-                "user",
-            )
+    @property
+    def metadata(self):
+        """Return stream metadata, marking the stream selected by default or not.
+
+        Without an input catalog only streams selected by default are synced.
+        """
+        if self._metadata is None:
+            metadata = super().metadata
+            metadata.root.selected_by_default = self.selected_by_default
+            if self._tap_input_catalog is None:
+                metadata.root.selected = self.selected_by_default
+        return self._metadata
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled session shared by every stream of the tap."""
+        return self._tap.requests_session
+
+    @property
+    def metrics(self) -> SyncMetrics:
+        """Return the run metrics collector shared by every stream of the tap."""
+        return self._tap.metrics
+
+    def _write_schema_message(self) -> None:
+        """Write SCHEMA messages without interleaving with other streams."""
+        with self._tap.output_lock:
+            super()._write_schema_message()
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write RECORD messages without interleaving with other streams."""
+        with self._tap.output_lock:
+            super()._write_record_message(record)
+
+    def _write_state_message(self) -> None:
+        """Write a STATE message from a consistent snapshot of the tap state.
+
+        With parallel_streams, other streams update their bookmarks while
+        this one writes, so the state is copied under the tap's state_lock.
+        The SDK's _sync_records finalizes a stream's progress markers without
+        that lock, so a copy that raced with it is taken again.
+        """
+        with self._tap.output_lock:
+            with self._tap.state_lock:
+                while True:
+                    try:
+                        state = copy.deepcopy(self.tap_state)
+                        break
+                    except RuntimeError:
+                        continue
+            singer.write_message(StateMessage(value=state))
+
+    @property
+    def stream_state(self) -> dict:
+        """Return the writable state of this stream, creating it under the state lock."""
+        with self._tap.state_lock:
+            return super().stream_state
+
+    def get_context_state(self, context: Optional[dict]) -> dict:
+        """Return the writable state of a context, creating it under the state lock."""
+        with self._tap.state_lock:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(
+        self, latest_record: Dict[str, Any], *, context: Optional[dict] = None
+    ) -> None:
+        with self._tap.state_lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: Optional[dict]) -> None:
+        with self._tap.state_lock:
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(self, context: Optional[dict], value) -> None:
+        with self._tap.state_lock:
+            super()._write_replication_key_signpost(context, value)
+
+    def finalize_state_progress_markers(self, state: Optional[dict] = None) -> None:
+        """Promote progress markers to bookmarks under the state lock."""
+        with self._tap.state_lock:
+            super().finalize_state_progress_markers(state)
+
+    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        """Yield records, counting them in the run metrics."""
+        count = 0
+        try:
+            for record in super().get_records(context):
+                count += 1
+                yield record
+        finally:
+            self.metrics.record_records(self.name, count)
+
+    @property
+    def admin_token(self) -> str:
+        """Return the shared admin token, fetching it on first use."""
+        return self._tap.token_manager.get_token("admin")
+
+    @property
+    def user_token(self) -> str:
+        """Return the shared user token, fetching it on first use."""
+        return self._tap.token_manager.get_token("user")
 
     @property
     def url_base(self) -> str:
@@ -104,6 +175,57 @@ class TapSuccessFactorsStream(RESTStream):
         headers["Authorization"] = self.admin_token
         return headers
 
+    @property
+    def page_size(self) -> Optional[int]:
+        """Return the configured OData $top page size, if any."""
+        return self.config.get("page_size")
+
+    def get_url_params(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Request bounded pages with $top/$skip when page_size is set."""
+        params: dict = {}
+        if self.page_size:
+            params["$top"] = self.page_size
+            params["$skip"] = next_page_token or 0
+        return params
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Yield the records of a response, reusing its decoded body."""
+        with self.metrics.timed("parse"):
+            data = response_json(response)
+        yield from extract_jsonpath(self.records_jsonpath, input=data)
+
+    def get_next_page_token(
+        self, response: requests.Response, previous_token: Optional[Any]
+    ) -> Any:
+        """Follow @odata.nextLink, else advance $skip while pages come back full."""
+        data = response_json(response)
+        next_link = data.get("@odata.nextLink")
+        if next_link:
+            return urljoin(response.url, next_link)
+        if (
+            self.page_size
+            and not isinstance(previous_token, str)
+            and len(data.get("value", [])) == self.page_size
+        ):
+            return (previous_token or 0) + self.page_size
+        return None
+
+    def prepare_request(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> requests.PreparedRequest:
+        """Request @odata.nextLink URLs as given, without re-adding parameters."""
+        if isinstance(next_page_token, str):
+            return self.requests_session.prepare_request(
+                requests.Request(
+                    method=self.rest_method,
+                    url=next_page_token,
+                    headers=self.http_headers,
+                )
+            )
+        return super().prepare_request(context, next_page_token)
+
     def response_error_message(self, response: requests.Response) -> str:
         """Build error message for invalid http statuses."""
         full_path = urlparse(response.url).path or self.path
@@ -120,8 +242,33 @@ class TapSuccessFactorsStream(RESTStream):
             f"{response.reason} for path: {full_path}"
         )
 
+    def request_decorator(self, func):
+        """Retry throttled and failed requests like the SDK, counting each retry."""
+        return backoff.on_exception(
+            backoff.expo,
+            (RetriableAPIError, requests.exceptions.ReadTimeout),
+            max_tries=5,
+            factor=2,
+            on_backoff=self._record_retry,
+        )(func)
+
+    def _record_retry(self, details: dict) -> None:
+        # backoff calls this while handling the exception that is retried.
+        error = sys.exc_info()[1]
+        url = ""
+        if isinstance(error, RetriableAPIError) and len(error.args) > 1:
+            url = error.args[1].url
+        elif getattr(error, "request", None) is not None:
+            url = error.request.url
+        self.metrics.record_retry(url)
+
     def validate_response(self, response):
-        data = response.json()
+        data = {}
+        if response.status_code >= HTTPStatus.BAD_REQUEST:
+            try:
+                data = response_json(response)
+            except ValueError:
+                pass
 
         if (
             response.status_code == HTTPStatus.TOO_MANY_REQUESTS  # 429
@@ -130,7 +277,7 @@ class TapSuccessFactorsStream(RESTStream):
             <= max(HTTPStatus)  # 511
         ):
             if (
-                "message" in data["error"]
+                "message" in data.get("error", {})
                 and "No search results for provided search criteria"
                 in data["error"]["message"]
             ):  # mainly used by ScheduledOfferings in case of no results found for search criteria
@@ -152,23 +299,12 @@ class TapSuccessFactorsStream(RESTStream):
                 and data["error_description"] == "The token has expired."
             ):
                 logging.warning("Token expired")
-                if response.request.headers["Authorization"] == self.admin_token:
-                    user_type = "admin"
-                elif response.request.headers["Authorization"] == self.user_token:
-                    user_type = "user"
-                logging.warning(f"Refreshing {user_type} token")
-                new_token = token_request(
-                    self.config["client_id"],
-                    self.config["client_secret"],
-                    self.config["base_url"],
-                    self.config["user_id"],
-                    self.config["company_id"],
-                    user_type,
+                token_manager = self._tap.token_manager
+                user_type = token_manager.invalidate(
+                    response.request.headers["Authorization"]
                 )
-                if user_type == "admin":
-                    self.admin_token = new_token
-                elif user_type == "user":
-                    self.user_token = new_token
+                logging.warning(f"Refreshing {user_type} token")
+                new_token = token_manager.get_token(user_type or "admin")
                 response.request.headers["Authorization"] = new_token
                 msg = self.response_error_message(response)
                 raise RetriableAPIError(msg, response)
@@ -179,9 +315,42 @@ class TapSuccessFactorsStream(RESTStream):
 
 class Catalogs(TapSuccessFactorsStream):
     name = "catalogs"
+    selected_by_default = True
     path = "/learning/odatav4/public/admin/catalog-service/v1/Catalogs"
     primary_keys = ["ID"]
     records_jsonpath = "$[*]"
+    # Feed key -> (CatalogsFeed navigation property, row builder, columns read).
+    feeds = {
+        "courses": (
+            "CoursesFeed",
+            "_course_row",
+            [
+                "componentID",
+                "componentTypeID",
+                "title",
+                "description",
+                "thumbnailURI",
+                "revisionDate",
+                "deliveryMethodID",
+                "deliveryMethodDesc",
+                "totalLength",
+                "creditHours",
+                "cpeHours",
+                "active",
+                "SubjectAreasFeed",
+            ],
+        ),
+        "curricula": (
+            "CurriculaFeed",
+            "_curricula_row",
+            ["curriculumID", "curriculumTitle", "description", "thumbnailURI"],
+        ),
+        "programs": (
+            "ProgramsFeed",
+            "_program_row",
+            ["programID", "programTitle", "description", "thumbnailURI"],
+        ),
+    }
     schema = th.PropertiesList(
         th.Property("Feed", th.StringType),
         th.Property("ID", th.StringType),
@@ -198,257 +367,751 @@ class Catalogs(TapSuccessFactorsStream):
         th.Property("active", th.BooleanType),
         th.Property("subjectAreaID", th.StringType),
         th.Property("subjectAreaDesc", th.StringType),
+        th.Property("localeID", th.StringType),
     ).to_dict()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (catalogID, locale) -> membership rows not yet synced to catalog_memberships.
+        self.memberships: Dict[tuple, List[dict]] = {}
+        # Items already emitted during this sync, across all listing pages.
+        self.seen = SeenSet() if self.config.get("catalogs_dedupe", True) else None
+
+    def _send_feed_request(self, url):
+        headers = {"Authorization": "{}".format(self.admin_token)}
+        response = self.requests_session.get(
+            url,
+            headers=headers,
+            timeout=self.timeout,
+            stream=self.config.get("stream_feed_pages", False),
+        )
+        self.validate_response(response)
+        return response
+
     def _get_response(self, url):
+        """GET a catalog-service URL, retrying throttled and server errors."""
+        return self.request_decorator(self._send_feed_request)(url)
+
+    def _send_batch_request(self, paths):
         headers = {"Authorization": "{}".format(self.admin_token)}
-        try:
-            response = requests.request("GET", url, headers=headers)
-            self.validate_response(response)
-            return response
-        except Exception as e:
-            logging.error(e)
-
-    def _get_catalogs_courses_feed(self, catalogId):
-        url = f"{self.url_base}/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalogId}')/CoursesFeed?$filter=criteria/localeID eq '{self.language}'"
-        response = self._get_response(url)
-
-        for course in response.json()["value"]:
-            subjectAreaID = None
-            subjectAreaDesc = None
-            if len(course["SubjectAreasFeed"]) > 0:
-                if "subjectAreaID" in course["SubjectAreasFeed"][0]:
-                    subjectAreaID = course["SubjectAreasFeed"][0]["subjectAreaID"]
-                if "subjectAreaDesc" in course["SubjectAreasFeed"][0]:
-                    subjectAreaDesc = course["SubjectAreasFeed"][0]["subjectAreaDesc"]
-            new_row = pd.DataFrame(
+        body = {
+            "requests": [
+                {"id": str(i), "method": "GET", "url": path}
+                for i, path in enumerate(paths)
+            ]
+        }
+        response = self.requests_session.post(
+            f"{self.url_base}{CATALOG_SERVICE_PATH}/$batch",
+            json=body,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        self.validate_response(response)
+        parts = {part["id"]: part for part in response_json(response)["responses"]}
+        results = []
+        for i in range(len(paths)):
+            part_response = batch_part_response(response, parts[str(i)])
+            self.validate_response(part_response)
+            results.append(response_json(part_response))
+        return results
+
+    def _get_batch_response(self, paths):
+        """GET several catalog-service paths in one JSON $batch request.
+
+        Returns the decoded body of each path, in order. The whole batch is
+        retried when any part is throttled or fails with a server error.
+        """
+        return self.request_decorator(self._send_batch_request)(paths)
+
+    def _feed_path(self, catalogId, feed, locale):
+        """Return the feed path relative to the catalog-service root."""
+        feed_name, _, columns = self.feeds[feed]
+        path = f"CatalogsFeed('{catalogId}')/{feed_name}?$filter=criteria/localeID eq '{locale}'"
+        if self.config.get("catalogs_select"):
+            path += f"&$select={','.join(columns)}"
+        return path
+
+    def _feed_url(self, catalogId, feed, locale):
+        return f"{self.url_base}{CATALOG_SERVICE_PATH}/{self._feed_path(catalogId, feed, locale)}"
+
+    def _page_url(self, url, skip):
+        if not self.page_size:
+            return url
+        return f"{url}&$top={self.page_size}&$skip={skip}"
+
+    def _get_feed_pages(self, url, first_page=None):
+        """Yield the ``value`` list of every page of a catalog feed.
+
+        ``first_page`` is the decoded first page when it was already fetched,
+        e.g. as part of a $batch request.
+        """
+        skip = 0
+        page_url = self._page_url(url, skip)
+        while page_url:
+            if first_page is not None:
+                records = first_page.get("value", [])
+                yield records
+                count, next_link = len(records), first_page.get("@odata.nextLink")
+                first_page = None
+            elif self.config.get("stream_feed_pages"):
+                response = self._get_response(page_url)
+                page = StreamedPage(response)
+                yield page
+                count, next_link = page.count, page.next_link
+            else:
+                response = self._get_response(page_url)
+                with self.metrics.timed("parse"):
+                    data = response_json(response)
+                records = data.get("value", [])
+                yield records
+                count, next_link = len(records), data.get("@odata.nextLink")
+            previous_url = page_url
+            if next_link:
+                page_url = urljoin(previous_url, next_link)
+            elif self.page_size and count == self.page_size:
+                skip += self.page_size
+                page_url = self._page_url(url, skip)
+            else:
+                page_url = None
+            if page_url == previous_url:
+                raise RuntimeError(f"Loop detected in pagination of {url}")
+
+    def _fetch_feed_pages(self, task):
+        """Yield (feed, raw page) for every page of the feeds of a task.
+
+        A task is (catalogId, locale, feeds). Each feed ends with a
+        (feed, None) marker. With ``catalogs_batch`` the first page of every
+        feed comes from a single $batch request. With ``stream_feed_pages``
+        a page is passed on in chunks of STREAM_CHUNK_SIZE records as they
+        are decoded.
+        """
+        catalogId, locale, feeds = task
+        first_pages = [None] * len(feeds)
+        if self.config.get("catalogs_batch"):
+            first_pages = self._get_batch_response(
                 [
-                    {
-                        "Feed": "courses",
-                        "ID": course["componentID"],
-                        "Title": course["title"],
-                        "Description": course["description"],
-                        "thumbnailURI": course["thumbnailURI"],
-                        "typeID": course["componentTypeID"],
-                        "revisionDate": course["revisionDate"],
-                        "deliveryMethodID": course["deliveryMethodID"],
-                        "deliveryMethodDesc": course["deliveryMethodDesc"],
-                        "totalLength": course["totalLength"],
-                        "creditHours": course["creditHours"],
-                        "cpeHours": course["cpeHours"],
-                        "active": course["active"],
-                        "subjectAreaID": subjectAreaID,
-                        "subjectAreaDesc": subjectAreaDesc,
-                    }
+                    self._page_url(self._feed_path(catalogId, feed, locale), 0)
+                    for feed in feeds
                 ]
             )
-            self.results_df = pd.concat(
-                [self.results_df, new_row], axis=0, ignore_index=True
+        for feed, first_page in zip(feeds, first_pages):
+            url = self._feed_url(catalogId, feed, locale)
+            for page in self._get_feed_pages(url, first_page):
+                if isinstance(page, StreamedPage):
+                    # Pass records on while the rest of the body downloads.
+                    chunk = []
+                    for record in page:
+                        chunk.append(record)
+                        if len(chunk) == STREAM_CHUNK_SIZE:
+                            yield feed, chunk
+                            chunk = []
+                    if chunk:
+                        yield feed, chunk
+                else:
+                    yield feed, page
+            yield feed, None
+
+    def _transform_feed_page(self, task, page):
+        """Map a raw feed page to (feed, flat catalog rows)."""
+        _, locale, _ = task
+        feed, records = page
+        if records is None:
+            return feed, None
+        row_builder = getattr(self, self.feeds[feed][1])
+        with self.metrics.timed("transform"):
+            return feed, [row_builder(record, locale) for record in records]
+
+    def _course_row(self, course, locale):
+        subjectAreaID = None
+        subjectAreaDesc = None
+        if len(course["SubjectAreasFeed"]) > 0:
+            if "subjectAreaID" in course["SubjectAreasFeed"][0]:
+                subjectAreaID = course["SubjectAreasFeed"][0]["subjectAreaID"]
+            if "subjectAreaDesc" in course["SubjectAreasFeed"][0]:
+                subjectAreaDesc = course["SubjectAreasFeed"][0]["subjectAreaDesc"]
+        return {
+            "Feed": "courses",
+            "ID": course["componentID"],
+            "Title": course["title"],
+            "Description": course["description"],
+            "thumbnailURI": course["thumbnailURI"],
+            "typeID": course["componentTypeID"],
+            "revisionDate": course["revisionDate"],
+            "deliveryMethodID": course["deliveryMethodID"],
+            "deliveryMethodDesc": course["deliveryMethodDesc"],
+            "totalLength": course["totalLength"],
+            "creditHours": course["creditHours"],
+            "cpeHours": course["cpeHours"],
+            "active": course["active"],
+            "subjectAreaID": subjectAreaID,
+            "subjectAreaDesc": subjectAreaDesc,
+            "localeID": locale,
+        }
+
+    def _curricula_row(self, curricula, locale):
+        return self._empty_row(
+            localeID=locale,
+            Feed="curricula",
+            ID=curricula["curriculumID"],
+            Title=curricula["curriculumTitle"],
+            Description=curricula["description"],
+            thumbnailURI=curricula["thumbnailURI"],
+        )
+
+    def _program_row(self, program, locale):
+        return self._empty_row(
+            localeID=locale,
+            Feed="programs",
+            ID=program["programID"],
+            Title=program["programTitle"],
+            Description=program["description"],
+            thumbnailURI=program["thumbnailURI"],
+        )
+
+    def _empty_row(self, **values) -> dict:
+        """Return a flat catalog row with every schema column set to None."""
+        row = dict.fromkeys(self.schema["properties"])
+        row.update(values)
+        return row
+
+    @property
+    def revision_bookmarks(self) -> Dict[str, int]:
+        """Return the writable catalogID:locale -> latest course revisionDate bookmarks."""
+        with self._tap.state_lock:
+            return self.stream_state.setdefault("catalog_revision_dates", {})
+
+    @property
+    def completed_catalogs(self) -> List[str]:
+        """Return the writable list of catalogs finished by the current run."""
+        with self._tap.state_lock:
+            return self.stream_state.setdefault("completed_catalogs", [])
+
+    def _bookmark_key(self, catalogId, locale):
+        return f"{catalogId}:{locale}"
+
+    def _migrate_bookmarks(self) -> None:
+        """Key bookmarks written without a locale by the first configured locale.
+
+        Runs with a single language used to key catalog bookmarks by
+        catalogID alone, so they stay valid when more languages are added.
+        """
+        locale = self.languages[0]
+        with self._tap.state_lock:
+            revision_dates = self.revision_bookmarks
+            for key in [key for key in revision_dates if ":" not in key]:
+                value = revision_dates.pop(key)
+                revision_dates.setdefault(self._bookmark_key(key, locale), value)
+            completed = self.completed_catalogs
+            completed[:] = [
+                key if ":" in key else self._bookmark_key(key, locale)
+                for key in completed
+            ]
+
+    def _get_catalogs(self, response):
+        catalogIds = [
+            catalog["catalogID"] for catalog in response_json(response)["value"]
+        ]
+        if self.config.get("catalogs_batch"):
+            feed_groups = [tuple(self.feeds)]
+        else:
+            feed_groups = [(feed,) for feed in self.feeds]
+        completed = self.completed_catalogs
+        if completed:
+            logging.info(
+                f"Resuming: skipping {len(completed)} catalog(s) completed by the previous run"
             )
+        skip = set(completed)
+        tasks = (
+            (catalogId, locale, feeds)
+            for catalogId in catalogIds
+            for locale in self.languages
+            if self._bookmark_key(catalogId, locale) not in skip
+            for feeds in feed_groups
+        )
+        incremental = self.config.get("catalogs_incremental")
+        membership_streams = [
+            stream for stream in self.child_streams if stream.selected
+        ]
+        fetched = emitted = duplicates = 0
+        latest = None
+        for task, result in pipelined_map(
+            tasks,
+            self._fetch_feed_pages,
+            self._transform_feed_page,
+            self.config.get("max_workers", 1),
+            self.config.get("pipeline_queue_size", DEFAULT_QUEUE_SIZE),
+        ):
+            if result is None:
+                continue
+            catalogId, locale, _ = task
+            feed, rows = result
+            if feed == "courses":
+                bookmark_key = self._bookmark_key(catalogId, locale)
+                since = self.revision_bookmarks.get(bookmark_key)
+            else:
+                since = None
+            if rows is not None:
+                fetched += len(rows)
+                if membership_streams:
+                    self.memberships.setdefault((catalogId, locale), []).extend(
+                        {
+                            "catalogID": catalogId,
+                            "Feed": row["Feed"],
+                            "ID": row["ID"],
+                            "localeID": locale,
+                        }
+                        for row in rows
+                    )
+                if feed == "courses":
+                    latest = max(
+                        [row["revisionDate"] for row in rows if row["revisionDate"]]
+                        + ([latest] if latest is not None else []),
+                        default=None,
+                    )
+                    if incremental and since is not None:
+                        rows = [
+                            row
+                            for row in rows
+                            if row["revisionDate"] is None
+                            or row["revisionDate"] > since
+                        ]
+                if self.seen is not None:
+                    unique_rows = [
+                        row
+                        for row in rows
+                        if self.seen.add(f"{row['Feed']}\x1f{row['ID']}\x1f{locale}")
+                    ]
+                    duplicates += len(rows) - len(unique_rows)
+                    rows = unique_rows
+                emitted += len(rows)
+                yield from rows
+                continue
 
-    def _get_catalogs_curricula_feed(self, catalogId):
-        url = f"{self.url_base}/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalogId}')/CurriculaFeed?$filter=criteria/localeID eq '{self.language}'"
-        response = self._get_response(url)
-        for curricula in response.json()["value"]:
-            new_row = pd.DataFrame(
-                [
-                    {
-                        "Feed": "curricula",
-                        "ID": curricula["curriculumID"],
-                        "Title": curricula["curriculumTitle"],
-                        "Description": curricula["description"],
-                        "thumbnailURI": curricula["thumbnailURI"],
-                        "typeID": None,
-                        "revisionDate": None,
-                        "deliveryMethodID": None,
-                        "deliveryMethodDesc": None,
-                        "totalLength": None,
-                        "creditHours": None,
-                        "cpeHours": None,
-                        "active": None,
-                        "subjectAreaID": None,
-                        "subjectAreaDesc": None,
-                    }
-                ]
+            # Every page of this feed has been emitted.
+            logging.info(f"Got {fetched} {feed} for catalogId: {catalogId} ({locale})")
+            if incremental and since is not None:
+                logging.info(
+                    f"Emitting {emitted} courses revised after {since} for catalogId: {catalogId}"
+                )
+            if duplicates:
+                logging.info(
+                    f"Skipped {duplicates} {feed} already emitted for another catalog"
+                )
+            self.metrics.record_records(f"catalogs.{feed}", emitted)
+            self.metrics.record_records(f"catalogs.{feed}.duplicates", duplicates)
+            if latest is not None:
+                with self._tap.state_lock:
+                    self.revision_bookmarks[bookmark_key] = max(latest, since or latest)
+            fetched = emitted = duplicates = 0
+            latest = None
+            if feed == list(self.feeds)[-1]:
+                # Every feed of this catalog and locale has been emitted.
+                for stream in membership_streams:
+                    stream.sync(context={"catalogID": catalogId, "localeID": locale})
+                self.memberships.pop((catalogId, locale), None)
+                with self._tap.state_lock:
+                    completed.append(self._bookmark_key(catalogId, locale))
+                self._write_state_message()
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request every page of the catalog listing, then end the run's checkpoints."""
+        self._migrate_bookmarks()
+        yield from super().request_records(context)
+        # The run is complete, the next one starts from the first catalog again.
+        with self._tap.state_lock:
+            self.stream_state.pop("completed_catalogs", None)
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse the response and yield catalog rows as each feed is read."""
+
+        if response_json(response):
+            yield from self._get_catalogs(response)
+
+    def _sync_children(self, child_context: dict) -> None:
+        """Skip the per-row child sync; memberships are synced per catalog."""
+
+
+class CatalogMemberships(TapSuccessFactorsStream):
+    """Items listed in each catalog, collected while `catalogs` is synced.
+
+    The `catalogs` stream emits every course, curriculum and program once,
+    so this stream keeps the catalogID -> item mapping that deduplication
+    drops. It is synced once per catalog and locale, when all three feeds of
+    the catalog have been read.
+    """
+
+    name = "catalog_memberships"
+    parent_stream_type = Catalogs
+    state_partitioning_keys = []
+    primary_keys = ["catalogID", "Feed", "ID"]
+    schema = th.PropertiesList(
+        th.Property("catalogID", th.StringType),
+        th.Property("Feed", th.StringType),
+        th.Property("ID", th.StringType),
+        th.Property("localeID", th.StringType),
+    ).to_dict()
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Yield the memberships buffered by `catalogs` for this catalog."""
+        catalogs = self._tap.streams["catalogs"]
+        yield from catalogs.memberships.get(
+            (context["catalogID"], context["localeID"]), []
+        )
+
+
+class CatalogsList(TapSuccessFactorsStream):
+    """Catalog IDs, used as the parent of the per-catalog feed streams."""
+
+    name = "catalogs_list"
+    primary_keys = ["catalogID"]
+    records_jsonpath = "$.value[0:]"
+    path = "/learning/odatav4/public/admin/catalog-service/v1/Catalogs"
+    schema_filepath = SCHEMAS_DIR / "catalogs.json"
+
+    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
+        """Return a context dictionary for child streams."""
+        return {"catalog_name": record["catalogID"]}
+
+
+class CatalogFeedStream(TapSuccessFactorsStream):
+    """Base class for the per-catalog feeds, read once per configured locale."""
+
+    parent_stream_type = CatalogsList
+    records_jsonpath = "$.value[0:]"
+    feed_name = ""
+
+    @property
+    def path(self) -> str:
+        """Return API URL path component for stream."""
+        main_path = f"/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{{catalog_name}}')/{self.feed_name}"
+        filters = "?$filter=criteria/localeID eq '{localeID}'"
+        return main_path + filters
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request the feed for every locale, tagging each record with it."""
+        for locale in self.languages:
+            for record in super().request_records({**context, "localeID": locale}):
+                record["localeID"] = locale
+                yield record
+
+
+class CatalogsCoursesFeed(CatalogFeedStream):
+    name = "catalogs_courses_feed"
+    feed_name = "CoursesFeed"
+    primary_keys = ["componentID"]
+    schema_filepath = SCHEMAS_DIR / "catalogs_courses_feed.json"
+
+    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
+        """Return a context dictionary for child streams."""
+        return {
+            "componentID": record["componentID"],
+            "componentTypeID": record["componentTypeID"],
+            "revisionDate": record["revisionDate"],
+        }
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse a page of courses and queue their child contexts for prefetch."""
+        records = list(super().parse_response(response))
+        for child_stream in self.child_streams:
+            if child_stream.selected and hasattr(child_stream, "scheduler"):
+                for record in records:
+                    child_stream.schedule(self.get_child_context(record, None))
+        yield from records
+
+    def _sync_children(self, child_context: dict) -> None:
+        """Sync each child context once, even when a course is in many catalogs."""
+        for child_stream in self.child_streams:
+            if not (child_stream.selected or child_stream.has_selected_descendents):
+                continue
+            if hasattr(child_stream, "scheduler") and not child_stream.claim(
+                child_context
+            ):
+                continue
+            child_stream.sync(context=child_context)
+
+
+class CatalogsCurriculaFeed(CatalogFeedStream):
+    name = "catalogs_curricula_feed"
+    feed_name = "CurriculaFeed"
+    primary_keys = ["curriculumID"]
+    schema_filepath = SCHEMAS_DIR / "catalogs_curricula_feed.json"
+
+
+class CatalogsProgramsFeed(CatalogFeedStream):
+    name = "catalogs_programs_feed"
+    feed_name = "ProgramsFeed"
+    primary_keys = ["programID"]
+    schema_filepath = SCHEMAS_DIR / "catalogs_programs_feed.json"
+
+
+class TargetUserStream(TapSuccessFactorsStream):
+    """Base class for the per-user streams, read once per target user."""
+
+    @property
+    def target_user_ids(self) -> List[str]:
+        """Return the users to extract, from target_user_id and target_user_ids_file."""
+        if not self._tap.target_user_ids:
+            raise ValueError(
+                f"Set target_user_id or target_user_ids_file to sync '{self.name}'"
+            )
+        return self._tap.target_user_ids
+
+    def _fetch_user_records(
+        self, user_id: str, context: Optional[dict] = None
+    ) -> List[dict]:
+        """Return the records of one user, tagged with targetUserID."""
+        records = list(
+            super().request_records({**(context or {}), "target_user_id": user_id})
+        )
+        for record in records:
+            record["targetUserID"] = user_id
+        return records
+
+
+class LearningHistorys(TargetUserStream):
+    name = "learning_historys"
+    primary_keys = ["componentID", "targetUserID"]
+    records_jsonpath = "$.value[0:]"
+    schema_filepath = SCHEMAS_DIR / "learning_historys.json"
+    replication_key = "fromDate"
+
+    @property
+    def window_seconds(self) -> Optional[int]:
+        """Return the backfill window length, or None outside backfill mode."""
+        window_days = self.config.get("learning_history_window_days")
+        return int(window_days * 86400) if window_days else None
+
+    def _get_from_date(self, user_id: str) -> int:
+        if "from_date" in self.config:
+            return self.config["from_date"]
+        bookmarks = self.stream_state.get("user_bookmarks", {})
+        if user_id in bookmarks:
+            return bookmarks[user_id]
+        # Bookmark written before per-user bookmarks existed.
+        if (
+            len(self.target_user_ids) == 1
+            and "replication_key_value" in self.stream_state
+        ):
+            return self.stream_state["replication_key_value"]
+        return 1325376000  # 2012-01-01 00:00:00 UTC
+
+    @property
+    def path(self) -> str:
+        """Return API URL path component for stream."""
+        main_path = (
+            "/learning/odatav4/public/user/userlearning-service/v1/learninghistorys"
+        )
+
+        # Users and windows are passed in the request context by request_records.
+        if self.window_seconds:
+            filters = "?$filter=criteria/targetUserID eq '{target_user_id}' and criteria/fromDate eq {window_from} and criteria/toDate eq {window_to}&$count=true"
+        else:
+            filters = "?$filter=criteria/targetUserID eq '{target_user_id}' and criteria/fromDate eq {window_from} &$count=true"
+        return main_path + filters
+
+    def _user_plan(self, user_id: str, to_date: int) -> dict:
+        """Return the window plan of a user, resuming an interrupted one from state.
+
+        The plan covers [from_date, to_date) in windows of window_seconds, or
+        in one window outside backfill mode. ``contiguous_until`` is the end
+        of the longest run of finished windows starting at from_date, and
+        ``completed_windows`` lists the starts of finished windows after it.
+        """
+        from_date = self._get_from_date(user_id)
+        plan = self.stream_state.get("backfill", {}).get(user_id)
+        if (
+            plan
+            and plan["window_seconds"] == self.window_seconds
+            and from_date in (plan["from_date"], plan["contiguous_until"])
+        ):
+            logging.info(
+                f"Resuming learning history of {user_id} at {plan['contiguous_until']} with {len(plan['completed_windows'])} later window(s) done"
+            )
+            return plan
+        if len(self.target_user_ids) == 1:
+            from_date_ts = datetime.datetime.utcfromtimestamp(from_date).strftime(
+                "%Y-%m-%d %H:%M:%S"
             )
-            self.results_df = pd.concat(
-                [self.results_df, new_row], axis=0, ignore_index=True
+            logging.info(
+                "Filtering 'learninghistorys' with from_date = %s", from_date_ts
             )
+        return {
+            "from_date": from_date,
+            "to_date": to_date,
+            "window_seconds": self.window_seconds,
+            "contiguous_until": from_date,
+            "completed_windows": [],
+        }
 
-    def _get_catalogs_programs_feed(self, catalogId):
-        url = f"{self.url_base}/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalogId}')/ProgramsFeed?$filter=criteria/localeID eq '{self.language}'"
-        response = self._get_response(url)
-        for program in response.json()["value"]:
-            new_row = pd.DataFrame(
-                [
-                    {
-                        "Feed": "programs",
-                        "ID": program["programID"],
-                        "Title": program["programTitle"],
-                        "Description": program["description"],
-                        "thumbnailURI": program["thumbnailURI"],
-                        "typeID": None,
-                        "revisionDate": None,
-                        "deliveryMethodID": None,
-                        "deliveryMethodDesc": None,
-                        "totalLength": None,
-                        "creditHours": None,
-                        "cpeHours": None,
-                        "active": None,
-                        "subjectAreaID": None,
-                        "subjectAreaDesc": None,
-                    }
-                ]
+    @staticmethod
+    def _advance_plan(plan: dict, finished: set, window_from: int) -> None:
+        """Mark a window of plan finished and advance contiguous_until past it.
+
+        ``finished`` holds the starts of finished windows after
+        contiguous_until; those the bookmark moves past are removed from it.
+        """
+        finished.add(window_from)
+        step = plan["window_seconds"] or plan["to_date"] - plan["from_date"]
+        while plan["contiguous_until"] in finished:
+            finished.remove(plan["contiguous_until"])
+            plan["contiguous_until"] = min(
+                plan["contiguous_until"] + step, plan["to_date"]
             )
-            self.results_df = pd.concat(
-                [self.results_df, new_row], axis=0, ignore_index=True
+        plan["completed_windows"] = sorted(finished)
+
+    def _fetch_window(self, window) -> List[dict]:
+        user_id, window_from, window_to = window
+        return self._fetch_user_records(
+            user_id, {"window_from": window_from, "window_to": window_to}
+        )
+
+    def _checkpoint(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if (
+            force
+            or len(self.target_user_ids) == 1
+            or now - self._last_checkpoint >= CHECKPOINT_SECONDS
+        ):
+            self._write_state_message()
+            self._last_checkpoint = now
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request the learning history of every target user, window by window.
+
+        Users and windows are fetched on learning_history_workers threads and
+        emitted as they finish. Each user's bookmark in ``user_bookmarks``
+        only advances to the end of its contiguous run of finished windows,
+        so an interrupted run never skips a window that was still in flight.
+        """
+        to_date = int(time.time())
+        with self._tap.state_lock:
+            plans = self.stream_state.setdefault("backfill", {})
+            bookmarks = self.stream_state.setdefault("user_bookmarks", {})
+        finished: Dict[str, set] = {}
+        remaining: Dict[str, int] = {}
+
+        def windows():
+            for user_id in self.target_user_ids:
+                plan = self._user_plan(user_id, to_date)
+                step = plan["window_seconds"] or max(
+                    1, plan["to_date"] - plan["contiguous_until"]
+                )
+                done = set(plan["completed_windows"])
+                starts = [
+                    start
+                    for start in range(plan["contiguous_until"], plan["to_date"], step)
+                    if start not in done
+                ]
+                if not starts:
+                    continue
+                with self._tap.state_lock:
+                    plans[user_id] = plan
+                finished[user_id] = done
+                remaining[user_id] = len(starts)
+                for start in starts:
+                    yield user_id, start, min(start + step, plan["to_date"])
+
+        logging.info(
+            f"Extracting learning history of {len(self.target_user_ids)} user(s)"
+            + (
+                f" in windows of {self.window_seconds // 86400} day(s)"
+                if self.window_seconds
+                else ""
             )
+        )
+        workers = self.config.get(
+            "learning_history_workers", self.config.get("max_workers", 1)
+        )
+        self._last_checkpoint = time.monotonic()
+        for (user_id, window_from, _), records in unordered_map(
+            self._fetch_window, windows(), workers
+        ):
+            plan = plans[user_id]
+            for record in records:
+                record["fromDate"] = plan["to_date"]
+                yield record
+            remaining[user_id] -= 1
+            with self._tap.state_lock:
+                self._advance_plan(plan, finished[user_id], window_from)
+                bookmarks[user_id] = plan["contiguous_until"]
+                if not remaining[user_id]:
+                    del plans[user_id]
+            if not remaining[user_id]:
+                del finished[user_id], remaining[user_id]
+            self._checkpoint()
+        with self._tap.state_lock:
+            self.stream_state.pop("backfill", None)
+        self._checkpoint(force=True)
 
-    def _get_catalogs(self, response):
-        for catalogId in response.json()["value"]:
-            catalogId = catalogId["catalogID"]
-            logging.info(f"Getting catalogId: {catalogId}")
-            self._get_catalogs_courses_feed(catalogId)
-            self._get_catalogs_curricula_feed(catalogId)
-            self._get_catalogs_programs_feed(catalogId)
 
-    def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        """Parse the response and return an iterator of result records."""
-
-        if response.json():
-            self._get_catalogs(response)
-            input = self.results_df.to_dict(orient="records")
-            for row in input:
-                yield from extract_jsonpath(self.records_jsonpath, input=row)
-
-
-# class Catalogs(TapSuccessFactorsStream):
-#     name = "catalogs"
-#     primary_keys = ["catalogID"]
-#     records_jsonpath = "$.value[0:]"
-#     path = "/learning/odatav4/public/admin/catalog-service/v1/Catalogs"
-#     schema_filepath = SCHEMAS_DIR / "catalogs.json"
-
-#     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
-#         """Return a context dictionary for child streams."""
-#         return {"catalog_name": record["catalogID"]}
-
-
-# class CatalogsCoursesFeed(TapSuccessFactorsStream):
-#     parent_stream_type = Catalogs
-#     name = "catalogs_courses_feed"
-#     primary_keys = ["componentID"]
-#     records_jsonpath = "$.value[0:]"
-#     schema_filepath = SCHEMAS_DIR / "catalogs_courses_feed.json"
-
-#     @property
-#     def path(self) -> str:
-#         """Return API URL path component for stream."""
-#         main_path = "/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalog_name}')/CoursesFeed"
-#         filters = f"?$filter=criteria/localeID eq '{self.language}'"
-#         return main_path + filters
-
-#     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
-#         """Return a context dictionary for child streams."""
-#         return {
-#             "componentID": record["componentID"],
-#             "componentTypeID": record["componentTypeID"],
-#             "revisionDate": record["revisionDate"],
-#         }
-
-
-# class CatalogsCurriculaFeed(TapSuccessFactorsStream):
-#     parent_stream_type = Catalogs
-#     name = "catalogs_curricula_feed"
-#     primary_keys = ["curriculumID"]
-#     records_jsonpath = "$.value[0:]"
-#     schema_filepath = SCHEMAS_DIR / "catalogs_curricula_feed.json"
-
-#     @property
-#     def path(self) -> str:
-#         """Return API URL path component for stream."""
-#         main_path = "/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalog_name}')/CurriculaFeed"
-#         filters = f"?$filter=criteria/localeID eq '{self.language}'"
-#         return main_path + filters
-
-
-# class CatalogsProgramsFeed(TapSuccessFactorsStream):
-#     parent_stream_type = Catalogs
-#     name = "catalogs_programs_feed"
-#     primary_keys = ["programID"]
-#     records_jsonpath = "$.value[0:]"
-#     schema_filepath = SCHEMAS_DIR / "catalogs_programs_feed.json"
-
-#     @property
-#     def path(self) -> str:
-#         """Return API URL path component for stream."""
-#         main_path = "/learning/odatav4/public/admin/catalog-service/v1/CatalogsFeed('{catalog_name}')/ProgramsFeed"
-#         filters = f"?$filter=criteria/localeID eq '{self.language}'"
-#         return main_path + filters
-
-
-# class LearningHistorys(TapSuccessFactorsStream):
-#     name = "learning_historys"
-#     primary_keys = ["componentID"]
-#     records_jsonpath = "$.value[0:]"
-#     schema_filepath = SCHEMAS_DIR / "learning_historys.json"
-#     replication_key = "fromDate"
-
-#     @property
-#     def path(self) -> str:
-#         """Return API URL path component for stream."""
-#         main_path = (
-#             "/learning/odatav4/public/user/userlearning-service/v1/learninghistorys"
-#         )
-
-#         self.to_date = int(time.time())
-
-#         if "from_date" in self.config:
-#             self.from_date = self.config["from_date"]
-#         else:
-#             if "replication_key_value" in self.stream_state:
-#                 self.from_date = self.stream_state["replication_key_value"]
-#             else:
-#                 self.from_date = 1325376000  # 2012-01-01 00:00:00 UTC
-
-#         from_date_ts = datetime.datetime.utcfromtimestamp(self.from_date).strftime(
-#             "%Y-%m-%d %H:%M:%S"
-#         )
-#         logging.info("Filtering 'learninghistorys' with from_date = %s", from_date_ts)
-
-#         filters = f"?$filter=criteria/targetUserID eq '{self.target_user_id}' and criteria/fromDate eq {self.from_date} &$count=true"
-#         return main_path + filters
-
-#     def post_process(self, row: dict, context: Optional[dict]) -> dict:
-#         row["fromDate"] = self.to_date
-#         return row
-
-
-# class ScheduledOfferings(TapSuccessFactorsStream):
-#     parent_stream_type = CatalogsCoursesFeed
-#     name = "scheduled_offerings"
-#     primary_keys = ["scheduleID"]
-#     records_jsonpath = "$.value[0:]"
-#     path = "/learning/odatav4/public/user/learningplan-service/v1/Scheduledofferings?$filter=lisCriteria/itemID eq '{componentID}' and lisCriteria/itemTypeID eq '{componentTypeID}' and lisCriteria/revisionDate eq {revisionDate}"
-#     schema_filepath = SCHEMAS_DIR / "scheduled_offerings.json"
-
-#     @property
-#     def http_headers(self) -> dict:
-#         """Return the http headers needed."""
-#         headers = {}
-#         headers["Authorization"] = f"{self.user_token}"
-#         return headers
-
-
-# class UserTodoLearningItems(TapSuccessFactorsStream):
-#     name = "user_todo_learning_items"
-#     primary_keys = ["sku"]
-#     records_jsonpath = "$.value[0:]"
-#     schema_filepath = SCHEMAS_DIR / "user_todo_learning_items.json"
-
-#     @property
-#     def path(self) -> str:
-#         """Return API URL path component for stream."""
-#         main_path = "/learning/odatav4/public/user/learningplan-service/v1/UserTodoLearningItems"
-#         filters = f"?$filter=criteria/maxRowNum eq 999999 and criteria/targetUserID eq '{self.target_user_id}'"
-#         return main_path + filters
+class ScheduledOfferings(TapSuccessFactorsStream):
+    parent_stream_type = CatalogsCoursesFeed
+    name = "scheduled_offerings"
+    primary_keys = ["scheduleID"]
+    records_jsonpath = "$.value[0:]"
+    path = "/learning/odatav4/public/user/learningplan-service/v1/Scheduledofferings?$filter=lisCriteria/itemID eq '{componentID}' and lisCriteria/itemTypeID eq '{componentTypeID}' and lisCriteria/revisionDate eq {revisionDate}"
+    schema_filepath = SCHEMAS_DIR / "scheduled_offerings.json"
+    # One request per course: keep a single stream-level state entry rather
+    # than a state partition per course.
+    state_partitioning_keys: List[str] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = FanOutScheduler(self.config.get("max_workers", 1))
+
+    @property
+    def http_headers(self) -> dict:
+        """Return the http headers needed."""
+        headers = {}
+        headers["Authorization"] = f"{self.user_token}"
+        return headers
+
+    @staticmethod
+    def _context_key(context: dict) -> tuple:
+        return (
+            context["componentID"],
+            context["componentTypeID"],
+            context["revisionDate"],
+        )
+
+    def _fetch_records(self, context: dict) -> List[dict]:
+        return list(super().request_records(context))
+
+    def schedule(self, context: dict) -> None:
+        """Prefetch the offerings of a course on the shared worker pool."""
+        self.scheduler.schedule(
+            self._context_key(context), lambda: self._fetch_records(context)
+        )
+
+    def claim(self, context: dict) -> bool:
+        """Return False if this course's offerings were already synced."""
+        return self.scheduler.claim(self._context_key(context))
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Yield the prefetched offerings for context, fetching them if needed."""
+        yield from self.scheduler.take(
+            self._context_key(context), lambda: self._fetch_records(context)
+        )
+
+
+class UserTodoLearningItems(TargetUserStream):
+    name = "user_todo_learning_items"
+    primary_keys = ["sku", "targetUserID"]
+    records_jsonpath = "$.value[0:]"
+    schema_filepath = SCHEMAS_DIR / "user_todo_learning_items.json"
+
+    @property
+    def path(self) -> str:
+        """Return API URL path component for stream."""
+        main_path = "/learning/odatav4/public/user/learningplan-service/v1/UserTodoLearningItems"
+        filters = "?$filter=criteria/maxRowNum eq 999999 and criteria/targetUserID eq '{target_user_id}'"
+        return main_path + filters
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request the to-do items of every target user, max_workers users at a time."""
+        for _, records in ordered_map(
+            self._fetch_user_records,
+            self.target_user_ids,
+            self.config.get("max_workers", 1),
+        ):
+            yield from records
@@ -1,28 +1,46 @@
 """successfactors tap class."""
-from typing import List
+import json
+import logging
+import threading
+
+import requests
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import List, Optional
 from singer_sdk import Tap, Stream
 from singer_sdk import typing as th
 
+from tap_successfactors.auth import TokenManager
+from tap_successfactors.cache import DEFAULT_MAX_MB, DEFAULT_TTL, ResponseCache
+from tap_successfactors.metrics import SyncMetrics
+from tap_successfactors.ratelimit import AdaptiveRateLimiter
+from tap_successfactors.session import DEFAULT_POOL_SIZE, build_session
+
 from tap_successfactors.streams import (
+    CatalogMemberships,
     Catalogs,
-    # CatalogsCoursesFeed,
-    # CatalogsCurriculaFeed,
-    # CatalogsProgramsFeed,
-    # LearningHistorys,
-    # ScheduledOfferings,
-    # UserTodoLearningItems,
+    CatalogsCoursesFeed,
+    CatalogsCurriculaFeed,
+    CatalogsList,
+    CatalogsProgramsFeed,
+    LearningHistorys,
+    ScheduledOfferings,
+    UserTodoLearningItems,
 )
 
 PLUGIN_NAME = "tap-successfactors"
 
 STREAM_TYPES = [
     Catalogs,
-    # CatalogsCoursesFeed,
-    # CatalogsCurriculaFeed,
-    # CatalogsProgramsFeed,
-    # LearningHistorys,
-    # ScheduledOfferings,
-    # UserTodoLearningItems,
+    CatalogMemberships,
+    CatalogsList,
+    CatalogsCoursesFeed,
+    CatalogsCurriculaFeed,
+    CatalogsProgramsFeed,
+    LearningHistorys,
+    ScheduledOfferings,
+    UserTodoLearningItems,
 ]
 
 
@@ -55,15 +73,21 @@ class TapSuccessfactors(Tap):
         ),
         th.Property(
             "language",
-            th.StringType,
+            th.CustomType({"type": ["string", "array"], "items": {"type": "string"}}),
             required=True,
-            description="Language (i.e. English)",
+            description="Language (i.e. English), or a list of languages to extract in one run",
         ),
         th.Property(
             "target_user_id",
-            th.StringType,
+            th.CustomType({"type": ["string", "array"], "items": {"type": "string"}}),
             required=True,
-            description="Target user ID (i.e. sfadmin)",
+            description="Target user ID (i.e. sfadmin), or a list of users to extract in one run",
+        ),
+        th.Property(
+            "target_user_ids_file",
+            th.StringType,
+            required=False,
+            description="File with more target user IDs, one per line",
         ),
         th.Property(
             "from_date",
@@ -71,8 +95,300 @@ class TapSuccessfactors(Tap):
             required=False,
             description="Datetime (specified in unix milliseconds) to use as the start of the date range for the tap",
         ),
+        th.Property(
+            "learning_history_window_days",
+            th.IntegerType,
+            required=False,
+            description="Backfill learning_historys in windows of this many days, fetched in parallel",
+        ),
+        th.Property(
+            "learning_history_workers",
+            th.IntegerType,
+            required=False,
+            description="Number of learning history users or windows fetched concurrently (default max_workers)",
+        ),
+        th.Property(
+            "max_workers",
+            th.IntegerType,
+            required=False,
+            description="Number of catalog feed and scheduled offering requests to run concurrently (default 1)",
+        ),
+        th.Property(
+            "parallel_streams",
+            th.IntegerType,
+            required=False,
+            description="Number of top-level streams (catalogs, learning history, to-do items, ...) synced concurrently (default 1)",
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            required=False,
+            description="Size of the shared keep-alive HTTP connection pool (default 10, at least max_workers)",
+        ),
+        th.Property(
+            "token_cache_path",
+            th.StringType,
+            required=False,
+            description="Optional file used to persist OAuth tokens between runs",
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            required=False,
+            description="OData $top page size; when unset only @odata.nextLink paging is followed",
+        ),
+        th.Property(
+            "catalogs_incremental",
+            th.BooleanType,
+            required=False,
+            description="Only emit catalog courses revised since the per-catalog revisionDate bookmark",
+        ),
+        th.Property(
+            "response_cache_dir",
+            th.StringType,
+            required=False,
+            description="Directory for an on-disk cache of catalog-service responses (disabled when unset)",
+        ),
+        th.Property(
+            "response_cache_ttl",
+            th.IntegerType,
+            required=False,
+            description="Seconds a cached catalog-service response is reused without revalidation (default 3600)",
+        ),
+        th.Property(
+            "response_cache_max_mb",
+            th.IntegerType,
+            required=False,
+            description="Size cap of the response cache in megabytes, least recently used entries are evicted first (default 512)",
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            required=False,
+            description="Ceiling of the adaptive rate limiter shared by all requests (unlimited until the API throttles when unset)",
+        ),
+        th.Property(
+            "catalogs_dedupe",
+            th.BooleanType,
+            required=False,
+            description="Emit each course, curriculum and program once per run even when it is listed in several catalogs (default true)",
+        ),
+        th.Property(
+            "catalogs_select",
+            th.BooleanType,
+            required=False,
+            description="Request only the feed columns the catalogs stream keeps with OData $select",
+        ),
+        th.Property(
+            "catalogs_batch",
+            th.BooleanType,
+            required=False,
+            description="Request the three feeds of a catalog in one OData JSON $batch call",
+        ),
+        th.Property(
+            "pipeline_queue_size",
+            th.IntegerType,
+            required=False,
+            description="Pages buffered per in-flight catalog feed and between the transform and emit stages (default 4)",
+        ),
+        th.Property(
+            "stream_feed_pages",
+            th.BooleanType,
+            required=False,
+            description="Decode catalog feed pages incrementally while they download (requires ijson)",
+        ),
+        th.Property(
+            "metrics_summary_path",
+            th.StringType,
+            required=False,
+            description="File to write the JSON metrics summary of the run to",
+        ),
+        th.Property(
+            "profile_sync",
+            th.StringType,
+            required=False,
+            description="Profile the sync with 'cprofile' or 'viztracer'",
+        ),
+        th.Property(
+            "profile_output",
+            th.StringType,
+            required=False,
+            description="Output file of the sync profile (default tap-successfactors.prof or tap-successfactors.json)",
+        ),
     ).to_dict()
 
+    _metrics: Optional[SyncMetrics] = None
+    _target_user_ids: Optional[List[str]] = None
+    _requests_session: Optional[requests.Session] = None
+    _token_manager: Optional[TokenManager] = None
+    _shared_lock = threading.Lock()
+    # Serializes Singer messages written by streams synced in parallel.
+    output_lock = threading.RLock()
+    # Held by every writer of the tap state and while it is snapshotted.
+    state_lock = threading.RLock()
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled HTTP session shared by token requests and all streams."""
+        with self._shared_lock:
+            if self._requests_session is None:
+                pool_size = max(
+                    self.config.get("http_pool_size", DEFAULT_POOL_SIZE),
+                    self.config.get("max_workers", 1)
+                    * self.config.get("parallel_streams", 1),
+                    self.config.get("learning_history_workers", 1),
+                )
+                cache = None
+                if self.config.get("response_cache_dir"):
+                    cache = ResponseCache(
+                        self.config["response_cache_dir"],
+                        ttl=self.config.get("response_cache_ttl", DEFAULT_TTL),
+                        max_bytes=self.config.get(
+                            "response_cache_max_mb", DEFAULT_MAX_MB
+                        )
+                        * 1024
+                        * 1024,
+                    )
+                limiter = AdaptiveRateLimiter(
+                    self.config.get("max_requests_per_second")
+                )
+                self._requests_session = build_session(
+                    pool_size, cache, limiter, self.metrics
+                )
+        return self._requests_session
+
+    @property
+    def target_user_ids(self) -> List[str]:
+        """Return the users of target_user_id and target_user_ids_file, in order."""
+        if self._target_user_ids is None:
+            configured = self.config.get("target_user_id") or []
+            user_ids = [configured] if isinstance(configured, str) else configured
+            if self.config.get("target_user_ids_file"):
+                with open(self.config["target_user_ids_file"]) as f:
+                    user_ids = user_ids + [line.strip() for line in f]
+            self._target_user_ids = list(dict.fromkeys(filter(None, user_ids)))
+        return self._target_user_ids
+
+    @property
+    def metrics(self) -> SyncMetrics:
+        """Return the request and throughput metrics collected during this run."""
+        if self._metrics is None:
+            self._metrics = SyncMetrics()
+        return self._metrics
+
+    @property
+    def token_manager(self) -> TokenManager:
+        """Return the OAuth token cache shared by all streams."""
+        session = self.requests_session
+        with self._shared_lock:
+            if self._token_manager is None:
+                self._token_manager = TokenManager(
+                    self.config, session, self.config.get("token_cache_path")
+                )
+        return self._token_manager
+
+    def sync_all(self) -> None:
+        """Sync all streams, then report the run metrics.
+
+        With ``profile_sync`` set, the sync runs under cProfile or viztracer.
+        """
+        profiler = self.config.get("profile_sync")
+        try:
+            if profiler == "cprofile":
+                import cProfile
+
+                output = self.config.get("profile_output", "tap-successfactors.prof")
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    self._sync_streams()
+                finally:
+                    profile.disable()
+                    profile.dump_stats(output)
+                logging.info(f"Wrote cProfile stats to {output}")
+            elif profiler == "viztracer":
+                from viztracer import VizTracer
+
+                output = self.config.get("profile_output", "tap-successfactors.json")
+                with VizTracer(output_file=output):
+                    self._sync_streams()
+            elif profiler:
+                raise ValueError(f"Unknown profile_sync value: {profiler}")
+            else:
+                self._sync_streams()
+        finally:
+            self.report_metrics()
+
+    def _sync_streams(self) -> None:
+        """Sync the selected top-level streams, parallel_streams at a time.
+
+        Child streams are still synced by their parent. Streams share the
+        HTTP session, token cache, rate limiter and metrics, and write their
+        Singer messages under output_lock.
+        """
+        parallel_streams = self.config.get("parallel_streams", 1)
+        if parallel_streams <= 1:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        streams = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info(f"Skipping deselected stream '{stream.name}'.")
+            elif not stream.parent_stream_type:
+                streams.append(stream)
+
+        def sync(stream: Stream) -> None:
+            stream.sync()
+            stream.finalize_state_progress_markers()
+
+        logging.info(
+            f"Syncing {len(streams)} streams with {parallel_streams} in parallel"
+        )
+        with ThreadPoolExecutor(max_workers=parallel_streams) as executor:
+            futures = [executor.submit(sync, stream) for stream in streams]
+            for future in futures:
+                future.result()
+
+    def report_metrics(self) -> None:
+        """Log Singer METRIC messages per endpoint and the JSON run summary."""
+        summary = self.metrics.summary()
+        for endpoint, stats in summary["endpoints"].items():
+            tags = {"endpoint": endpoint}
+            for metric_type, metric, value in [
+                ("counter", "http_request_count", stats["requests"]),
+                ("counter", "http_cache_hits", stats["cache_hits"]),
+                ("counter", "http_retries", stats["retries"]),
+                (
+                    "counter",
+                    "http_throttled_or_server_errors",
+                    stats["throttled_or_server_errors"],
+                ),
+                ("counter", "http_bytes", stats["bytes"]),
+                ("timer", "http_request_duration", stats["seconds"]),
+            ]:
+                point = {
+                    "type": metric_type,
+                    "metric": metric,
+                    "value": value,
+                    "tags": tags,
+                }
+                logging.info(f"METRIC: {json.dumps(point)}")
+        for name, count in summary["records"].items():
+            point = {
+                "type": "counter",
+                "metric": "record_count",
+                "value": count,
+                "tags": {"stream": name},
+            }
+            logging.info(f"METRIC: {json.dumps(point)}")
+        logging.info(f"Sync metrics summary: {json.dumps(summary)}")
+        if self.config.get("metrics_summary_path"):
+            with open(self.config["metrics_summary_path"], "w") as f:
+                json.dump(summary, f, indent=2)
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         streams = [stream_class(tap=self) for stream_class in STREAM_TYPES]
@@ -0,0 +1,87 @@
+"""Shared fixtures for the tap-successfactors tests."""
+
+import contextlib
+import io
+import json
+import sys
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from mock_server import MockData, MockSuccessFactorsServer  # noqa: E402
+
+from tap_successfactors.tap import TapSuccessfactors  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    """Return a factory that starts mock SuccessFactors servers for a test."""
+    servers = []
+
+    def start(data=None, **data_kwargs):
+        server = MockSuccessFactorsServer(data or MockData(**data_kwargs)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_tap(server, config=None, state=None, select=()):
+    """Return a tap reading from server with only the streams in select selected."""
+    config = {
+        "base_url": server.base_url,
+        "client_id": "test",
+        "client_secret": "test",
+        "user_id": "test",
+        "company_id": "test",
+        "language": "English",
+        "target_user_id": "test",
+        **(config or {}),
+    }
+    catalog = TapSuccessfactors(config=config, parse_env_config=False).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in select
+    return TapSuccessfactors(
+        config=config, catalog=catalog, state=state, parse_env_config=False
+    )
+
+
+def capture_messages(sync):
+    """Call sync and return the Singer messages it wrote to stdout."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        sync()
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def run_sync(server, stream_name, config=None, state=None, select=()):
+    """Sync one stream of a tap against server and return its Singer messages.
+
+    The stream and the streams in select are selected, all others are not.
+    """
+    tap = make_tap(server, config, state, (stream_name, *select))
+    return capture_messages(tap.streams[stream_name].sync)
+
+
+def records(messages, stream_name):
+    return [
+        message["record"]
+        for message in messages
+        if message["type"] == "RECORD" and message["stream"] == stream_name
+    ]
+
+
+def bookmarks(messages, stream_name):
+    return [
+        message["value"]["bookmarks"].get(stream_name, {})
+        for message in messages
+        if message["type"] == "STATE"
+    ]
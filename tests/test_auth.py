@@ -0,0 +1,72 @@
+"""Tests for the OAuth token cache in tap_successfactors.auth."""
+
+import os
+import threading
+
+import requests
+
+from tap_successfactors.auth import TokenManager
+
+
+def token_manager(server, cache_path=None):
+    config = {
+        "base_url": server.base_url,
+        "client_id": "test",
+        "client_secret": "test",
+        "user_id": "test",
+        "company_id": "test",
+    }
+    return TokenManager(config, requests.Session(), cache_path)
+
+
+def token_requests(server):
+    return server.stats()["by_endpoint"].get("token", 0)
+
+
+def test_token_is_reused_until_the_refresh_margin(mock_server):
+    server = mock_server(catalogs=1)
+    tokens = token_manager(server)
+    assert tokens.get_token("admin") == tokens.get_token("admin")
+    assert token_requests(server) == 1
+
+    # A token that expires within the refresh margin is replaced on every use.
+    server.token_expires_in = 30
+    tokens = token_manager(server)
+    first = tokens.get_token("admin")
+    assert tokens.get_token("admin") != first
+    assert token_requests(server) == 3
+
+
+def test_rejected_token_is_refreshed_once(mock_server):
+    server = mock_server(catalogs=1)
+    tokens = token_manager(server)
+    rejected = tokens.get_token("admin")
+    results = []
+
+    def retry():
+        tokens.invalidate(rejected)
+        results.append(tokens.get_token("admin"))
+
+    threads = [threading.Thread(target=retry) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1 and results[0] != rejected
+    assert token_requests(server) == 2
+    # A late invalidation of the old token keeps the refreshed one.
+    assert tokens.invalidate(rejected) == "admin"
+    assert tokens.get_token("admin") == results[0]
+    assert tokens.user_type_of("Bearer unknown") is None
+
+
+def test_tokens_are_reused_from_the_cache_file(mock_server, tmp_path):
+    server = mock_server(catalogs=1)
+    cache_path = tmp_path / "tokens.json"
+
+    token = token_manager(server, cache_path).get_token("user")
+
+    assert os.stat(cache_path).st_mode & 0o777 == 0o600
+    assert token_manager(server, cache_path).get_token("user") == token
+    assert token_requests(server) == 1
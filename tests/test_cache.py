@@ -0,0 +1,85 @@
+"""Tests for the on-disk response cache in tap_successfactors.cache."""
+
+import os
+
+from tap_successfactors.cache import ResponseCache
+from tap_successfactors.session import build_session
+
+CATALOGS_PATH = "/learning/odatav4/public/admin/catalog-service/v1/Catalogs"
+HISTORY_PATH = "/learning/odatav4/public/user/userlearning-service/v1/learninghistorys"
+
+
+def requests_to(server, endpoint):
+    return server.stats()["by_endpoint"].get(endpoint, 0)
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(directory / name) for name in os.listdir(directory))
+
+
+def test_fresh_entries_skip_the_network(mock_server, tmp_path):
+    server = mock_server(catalogs=3)
+    session = build_session(cache=ResponseCache(tmp_path, ttl=3600))
+
+    first = session.get(server.base_url + CATALOGS_PATH)
+    second = session.get(server.base_url + CATALOGS_PATH)
+
+    assert requests_to(server, "Catalogs") == 1
+    assert second.headers["X-Tap-Cache"] == "HIT"
+    assert second.json() == first.json()
+
+
+def test_stale_entries_are_revalidated(mock_server, tmp_path):
+    server = mock_server(catalogs=3)
+    session = build_session(cache=ResponseCache(tmp_path, ttl=0))
+
+    first = session.get(server.base_url + CATALOGS_PATH)
+    bytes_sent = server.stats()["bytes_sent"]
+    second = session.get(server.base_url + CATALOGS_PATH)
+
+    # The server was asked again but answered 304 without a body.
+    assert requests_to(server, "Catalogs") == 2
+    assert server.stats()["bytes_sent"] == bytes_sent
+    assert second.status_code == 200
+    assert second.headers["X-Tap-Cache"] == "HIT"
+    assert second.json() == first.json()
+
+
+def test_user_endpoints_are_not_cached(mock_server, tmp_path):
+    server = mock_server(catalogs=1)
+    session = build_session(cache=ResponseCache(tmp_path, ttl=3600))
+
+    session.get(server.base_url + HISTORY_PATH)
+    session.get(server.base_url + HISTORY_PATH)
+
+    assert requests_to(server, "learninghistorys") == 2
+    assert not os.listdir(tmp_path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=5000)
+    for n in range(8):
+        cache.put(f"key{n}", b"x" * 500, {})
+    cache.get("key0")
+
+    for n in range(8, 12):
+        cache.put(f"key{n}", b"x" * 500, {})
+
+    assert cache.get("key0") is not None
+    assert cache.get("key1") is None
+    assert cache.get("key11") is not None
+    assert disk_bytes(tmp_path) <= 5000
+
+
+def test_cache_size_is_tracked_across_overwrites_and_runs(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=5000)
+    for n in range(100):
+        cache.put("key", b"x" * (n + 1), {})
+    cache.put("other", b"y" * 1000, {})
+
+    assert cache.get("key")[1] == b"x" * 100
+    assert cache._total_bytes == disk_bytes(tmp_path)
+
+    reopened = ResponseCache(tmp_path, max_bytes=5000)
+    reopened.put("third", b"z" * 10, {})
+    assert reopened._total_bytes == disk_bytes(tmp_path)
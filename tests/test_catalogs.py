@@ -0,0 +1,204 @@
+"""Tests for the catalogs stream against the benchmark mock server."""
+
+import pytest
+import requests
+
+from conftest import bookmarks, records, run_sync
+from mock_server import MockData
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+from tap_successfactors.decoding import batch_part_response, response_json
+from tap_successfactors.tap import TapSuccessfactors
+
+
+class DescendingRevisions(MockData):
+    """Catalog feeds served newest course first."""
+
+    def feed(self, catalog_id, feed, locale):
+        return list(reversed(super().feed(catalog_id, feed, locale)))
+
+
+def item_keys(rows):
+    return [(row["Feed"], row["ID"]) for row in rows]
+
+
+def test_items_are_emitted_once_across_listing_pages(mock_server):
+    server = mock_server(catalogs=10, courses=50)
+
+    unpaged = item_keys(records(run_sync(server, "catalogs"), "catalogs"))
+    paged = item_keys(
+        records(run_sync(server, "catalogs", {"page_size": 7}), "catalogs")
+    )
+
+    assert len(paged) == len(set(paged))
+    assert sorted(paged) == sorted(unpaged)
+
+
+def test_completed_catalogs_grow_across_listing_pages(mock_server):
+    server = mock_server(catalogs=10, courses=50)
+
+    states = bookmarks(run_sync(server, "catalogs", {"page_size": 7}), "catalogs")
+    completed = [state["completed_catalogs"] for state in states[:-1]]
+
+    for before, after in zip(completed, completed[1:]):
+        assert after[: len(before)] == before
+    assert completed[-1] == [
+        f"{catalog_id}:English" for catalog_id in MockData(catalogs=10).catalog_ids()
+    ]
+    assert "completed_catalogs" not in states[-1]
+
+
+def test_resume_skips_completed_catalogs(mock_server):
+    server = mock_server(catalogs=10, courses=50)
+    # Written by a single-language run, before bookmarks were keyed by locale.
+    state = {
+        "bookmarks": {
+            "catalogs": {"completed_catalogs": [f"CAT{i:05d}" for i in range(7)]}
+        }
+    }
+
+    messages = run_sync(
+        server, "catalogs", {"page_size": 7}, state, select=["catalog_memberships"]
+    )
+
+    assert {row["catalogID"] for row in records(messages, "catalog_memberships")} == {
+        "CAT00007",
+        "CAT00008",
+        "CAT00009",
+    }
+    assert server.stats()["by_endpoint"]["CoursesFeed"] == 3 * 8
+
+
+def test_revision_bookmark_is_the_latest_of_the_whole_feed(mock_server):
+    data = DescendingRevisions(catalogs=2, courses=20)
+    server = mock_server(data)
+
+    messages = run_sync(server, "catalogs", {"page_size": 7})
+    revision_dates = bookmarks(messages, "catalogs")[-1]["catalog_revision_dates"]
+
+    assert revision_dates == {
+        f"{catalog_id}:English": max(
+            course["revisionDate"]
+            for course in data.feed(catalog_id, "CoursesFeed", "English")
+        )
+        for catalog_id in data.catalog_ids()
+    }
+    rerun = run_sync(
+        server,
+        "catalogs",
+        {"page_size": 7, "catalogs_incremental": True},
+        {"bookmarks": {"catalogs": {"catalog_revision_dates": revision_dates}}},
+    )
+    assert not [row for row in records(rerun, "catalogs") if row["Feed"] == "courses"]
+
+
+def test_bookmarks_are_kept_per_locale(mock_server):
+    data = MockData(catalogs=2, courses=10)
+    server = mock_server(data)
+    config = {"language": ["English", "German"]}
+
+    messages = run_sync(server, "catalogs", config, select=["catalog_memberships"])
+
+    schema = next(
+        message
+        for message in messages
+        if message["type"] == "SCHEMA" and message["stream"] == "catalogs"
+    )
+    assert schema["key_properties"] == ["ID", "localeID"]
+    rows = records(messages, "catalogs")
+    assert {row["localeID"] for row in rows} == {"English", "German"}
+    assert len(rows) == 2 * len({(row["Feed"], row["ID"]) for row in rows})
+    assert {
+        (row["catalogID"], row["localeID"])
+        for row in records(messages, "catalog_memberships")
+    } == {
+        (catalog_id, locale)
+        for catalog_id in data.catalog_ids()
+        for locale in ("English", "German")
+    }
+    assert sorted(bookmarks(messages, "catalogs")[-1]["catalog_revision_dates"]) == [
+        "CAT00000:English",
+        "CAT00000:German",
+        "CAT00001:English",
+        "CAT00001:German",
+    ]
+
+
+def test_single_language_bookmarks_carry_over_to_the_first_locale(mock_server):
+    data = MockData(catalogs=2, courses=10)
+    server = mock_server(data)
+    latest = {
+        catalog_id: max(
+            course["revisionDate"]
+            for course in data.feed(catalog_id, "CoursesFeed", "English")
+        )
+        for catalog_id in data.catalog_ids()
+    }
+
+    messages = run_sync(
+        server,
+        "catalogs",
+        {"language": ["English", "German"], "catalogs_incremental": True},
+        {"bookmarks": {"catalogs": {"catalog_revision_dates": dict(latest)}}},
+    )
+
+    courses = [row for row in records(messages, "catalogs") if row["Feed"] == "courses"]
+    assert courses and {row["localeID"] for row in courses} == {"German"}
+    revision_dates = bookmarks(messages, "catalogs")[-1]["catalog_revision_dates"]
+    assert all(":" in key for key in revision_dates)
+    assert revision_dates["CAT00000:English"] == latest["CAT00000"]
+
+
+def test_batch_returns_the_same_records_in_fewer_requests(mock_server):
+    server = mock_server(catalogs=4, courses=20)
+    unbatched = records(run_sync(server, "catalogs", {"page_size": 7}), "catalogs")
+    before = server.stats()
+
+    batched = records(
+        run_sync(server, "catalogs", {"page_size": 7, "catalogs_batch": True}),
+        "catalogs",
+    )
+    after = server.stats()
+
+    assert item_keys(batched) == item_keys(unbatched)
+    counts = {
+        endpoint: count - before["by_endpoint"].get(endpoint, 0)
+        for endpoint, count in after["by_endpoint"].items()
+    }
+    assert counts["$batch"] == 4
+    for feed in ("CoursesFeed", "CurriculaFeed", "ProgramsFeed"):
+        assert counts[f"{feed} (batched)"] == 4
+    # Only the pages after the first are still requested one by one.
+    assert counts.get("CoursesFeed", 0) == 4 * 2
+    assert after["requests"] - before["requests"] < before["requests"]
+
+
+@pytest.mark.parametrize(
+    "status, error", [(200, None), (404, FatalAPIError), (503, RetriableAPIError)]
+)
+def test_batch_parts_are_validated_one_by_one(status, error):
+    tap = TapSuccessfactors(
+        config={
+            "base_url": "https://example.invalid",
+            "client_id": "test",
+            "client_secret": "test",
+            "user_id": "test",
+            "company_id": "test",
+            "language": "English",
+            "target_user_id": "test",
+        },
+        parse_env_config=False,
+    )
+    batch = requests.Response()
+    batch.url = "https://example.invalid/catalog-service/v1/$batch"
+    body = {"value": [{"ID": "COURSE1"}]}
+
+    part = batch_part_response(batch, {"id": "0", "status": status, "body": body})
+
+    assert part.status_code == status
+    assert response_json(part) == body
+    if error is None:
+        tap.streams["catalogs"].validate_response(part)
+    else:
+        with pytest.raises(error):
+            tap.streams["catalogs"].validate_response(part)
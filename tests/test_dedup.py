@@ -0,0 +1,26 @@
+"""Tests for tap_successfactors.dedup."""
+
+import random
+
+from tap_successfactors.dedup import SeenSet
+
+
+def test_seen_set_behaves_as_a_set():
+    keys = [f"courses\x1fCOURSE{random.randrange(5000):07d}" for _ in range(20000)]
+    seen = SeenSet()
+    expected = set()
+
+    for key in keys:
+        assert seen.add(key) == (key not in expected)
+        expected.add(key)
+
+    assert len(seen) == len(expected)
+    assert not any(seen.add(key) for key in expected)
+
+
+def test_seen_set_keeps_keys_when_it_grows():
+    seen = SeenSet(capacity=4)
+    for n in range(1000):
+        assert seen.add(str(n))
+    assert len(seen) == 1000
+    assert not any(seen.add(str(n)) for n in range(1000))
@@ -0,0 +1,105 @@
+"""Tests for the learning_historys window backfill."""
+
+from conftest import bookmarks, records, run_sync
+from mock_server import MockData
+
+from tap_successfactors.streams import LearningHistorys
+
+FROM_DATE = 1325376000
+STEP = 365 * 86400
+
+
+def new_plan(windows):
+    return {
+        "from_date": FROM_DATE,
+        "to_date": FROM_DATE + windows * STEP,
+        "window_seconds": STEP,
+        "contiguous_until": FROM_DATE,
+        "completed_windows": [],
+    }
+
+
+def test_bookmark_only_advances_over_contiguous_windows():
+    plan = new_plan(4)
+    finished = set()
+
+    LearningHistorys._advance_plan(plan, finished, FROM_DATE + STEP)
+    LearningHistorys._advance_plan(plan, finished, FROM_DATE + 3 * STEP)
+    assert plan["contiguous_until"] == FROM_DATE
+    assert plan["completed_windows"] == [FROM_DATE + STEP, FROM_DATE + 3 * STEP]
+
+    LearningHistorys._advance_plan(plan, finished, FROM_DATE)
+    assert plan["contiguous_until"] == FROM_DATE + 2 * STEP
+    assert plan["completed_windows"] == [FROM_DATE + 3 * STEP]
+
+    LearningHistorys._advance_plan(plan, finished, FROM_DATE + 2 * STEP)
+    assert plan["contiguous_until"] == plan["to_date"]
+    assert plan["completed_windows"] == []
+
+
+def test_resumed_plan_skips_finished_windows(mock_server):
+    data = MockData(catalogs=1, courses=1, history=600)
+    server = mock_server(data)
+    plan = new_plan(10)
+    plan["contiguous_until"] = FROM_DATE + 2 * STEP
+    plan["completed_windows"] = [FROM_DATE + 4 * STEP, FROM_DATE + 5 * STEP]
+    state = {
+        "bookmarks": {
+            "learning_historys": {
+                "backfill": {"test": plan},
+                "user_bookmarks": {"test": plan["contiguous_until"]},
+            }
+        }
+    }
+
+    messages = run_sync(
+        server,
+        "learning_historys",
+        {"learning_history_window_days": 365, "max_workers": 4},
+        state,
+    )
+
+    pending = [2, 3, 6, 7, 8, 9]
+    assert server.stats()["by_endpoint"]["learninghistorys"] == len(pending)
+    expected = [
+        record["componentID"]
+        for n in pending
+        for record in data.learning_history(
+            FROM_DATE + n * STEP, FROM_DATE + (n + 1) * STEP
+        )
+    ]
+    emitted = records(messages, "learning_historys")
+    assert sorted(record["componentID"] for record in emitted) == sorted(expected)
+    final = bookmarks(messages, "learning_historys")[-1]
+    assert final["user_bookmarks"] == {"test": plan["to_date"]}
+    assert "backfill" not in final
+
+
+def test_users_added_later_start_from_their_own_bookmark(mock_server, tmp_path):
+    server = mock_server(MockData(catalogs=1, courses=1, history=600))
+    user_ids_file = tmp_path / "users.txt"
+    user_ids_file.write_text("b\n")
+    config = {"target_user_id": "a", "target_user_ids_file": str(user_ids_file)}
+
+    first = run_sync(server, "learning_historys", config)
+    rows = records(first, "learning_historys")
+    user_bookmarks = bookmarks(first, "learning_historys")[-1]["user_bookmarks"]
+    assert {row["targetUserID"] for row in rows} == {"a", "b"}
+    assert len(rows) == 2 * 600
+    assert sorted(user_bookmarks) == ["a", "b"]
+
+    user_ids_file.write_text("b\nc\n")
+    rerun = run_sync(
+        server,
+        "learning_historys",
+        config,
+        {"bookmarks": {"learning_historys": {"user_bookmarks": dict(user_bookmarks)}}},
+    )
+    rows = records(rerun, "learning_historys")
+    assert {row["targetUserID"] for row in rows} == {"c"}
+    assert len(rows) == 600
+    assert sorted(bookmarks(rerun, "learning_historys")[-1]["user_bookmarks"]) == [
+        "a",
+        "b",
+        "c",
+    ]
@@ -0,0 +1,59 @@
+"""Tests for the run metrics in tap_successfactors.metrics."""
+
+import pytest
+import requests
+
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_successfactors.metrics import SyncMetrics
+from tap_successfactors.tap import TapSuccessfactors
+
+CATALOGS_URL = (
+    "https://example.invalid/learning/odatav4/public/admin/catalog-service/v1/Catalogs"
+)
+
+
+def test_requests_are_counted_per_endpoint():
+    metrics = SyncMetrics()
+    metrics.record_request(CATALOGS_URL, 0.07, 200, 100)
+    metrics.record_request(CATALOGS_URL, 3.0, 429, 10)
+    metrics.record_request(CATALOGS_URL + "('CAT1')/CoursesFeed", 0.01, 404, 0)
+
+    endpoints = metrics.summary()["endpoints"]
+    assert endpoints["catalogs"]["requests"] == 2
+    assert endpoints["catalogs"]["bytes"] == 110
+    assert endpoints["catalogs"]["throttled_or_server_errors"] == 1
+    assert endpoints["catalogs"]["retries"] == 0
+    assert endpoints["catalogs"]["histogram"]["le_0.1"] == 1
+    assert endpoints["catalogs"]["histogram"]["le_5.0"] == 1
+    assert endpoints["courses_feed"]["errors"] == 1
+
+
+def test_only_requests_sent_again_count_as_retries(monkeypatch):
+    monkeypatch.setattr("backoff._sync.time.sleep", lambda seconds: None)
+    tap = TapSuccessfactors(
+        config={
+            "base_url": "https://example.invalid",
+            "client_id": "test",
+            "client_secret": "test",
+            "user_id": "test",
+            "company_id": "test",
+            "language": "English",
+            "target_user_id": "test",
+        },
+        parse_env_config=False,
+    )
+    attempts = []
+
+    def send(url):
+        attempts.append(url)
+        response = requests.Response()
+        response.status_code = 429
+        response.url = url
+        raise RetriableAPIError("Too many requests", response)
+
+    with pytest.raises(RetriableAPIError):
+        tap.streams["catalogs"].request_decorator(send)(CATALOGS_URL)
+
+    assert len(attempts) == 5
+    assert tap.metrics.summary()["endpoints"]["catalogs"]["retries"] == 4
@@ -0,0 +1,87 @@
+"""Tests for the thread pipelines in tap_successfactors.pipeline."""
+
+import random
+import time
+
+import pytest
+
+from tap_successfactors.pipeline import ordered_map, pipelined_map, unordered_map
+
+
+def fetch_pages(item):
+    for page in range(3):
+        time.sleep(random.random() / 500)
+        yield [f"{item}-{page}-{n}" for n in range(2)]
+
+
+def upper(item, page):
+    return [row.upper() for row in page]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_pipelined_map_keeps_item_and_page_order(max_workers):
+    result = list(pipelined_map(range(10), fetch_pages, upper, max_workers, 2))
+
+    expected = []
+    for item in range(10):
+        for page in fetch_pages(item):
+            expected.append((item, upper(item, page)))
+        expected.append((item, None))
+    assert result == expected
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_pipelined_map_propagates_fetch_errors(max_workers):
+    def fetch(item):
+        if item == 5:
+            raise ValueError("fetch failed")
+        yield from fetch_pages(item)
+
+    with pytest.raises(ValueError, match="fetch failed"):
+        list(pipelined_map(range(10), fetch, upper, max_workers))
+
+
+def test_pipelined_map_propagates_transform_errors():
+    def transform(item, page):
+        if item == 3:
+            raise KeyError("transform failed")
+        return page
+
+    with pytest.raises(KeyError, match="transform failed"):
+        list(pipelined_map(range(10), fetch_pages, transform, 4))
+
+
+def test_ordered_map_keeps_input_order():
+    def slow_square(n):
+        time.sleep(random.random() / 500)
+        return n * n
+
+    assert list(ordered_map(slow_square, range(20), 4)) == [
+        (n, n * n) for n in range(20)
+    ]
+
+
+def test_unordered_map_yields_every_item_once():
+    def slow_square(n):
+        time.sleep(random.random() / 500)
+        return n * n
+
+    result = list(unordered_map(slow_square, range(50), 4))
+    assert sorted(result) == [(n, n * n) for n in range(50)]
+
+
+def test_pipelined_map_skips_queued_items_after_an_error():
+    fetched = []
+
+    def fetch(item):
+        fetched.append(item)
+        if item == 0:
+            raise ValueError("fetch failed")
+        time.sleep(0.2)
+        yield [item]
+
+    with pytest.raises(ValueError, match="fetch failed"):
+        list(pipelined_map(range(100), fetch, upper, 2))
+
+    # Items 1 and 2 were running when the error came in, item 3 was queued.
+    assert sorted(fetched) == [0, 1, 2]
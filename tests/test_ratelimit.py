@@ -0,0 +1,74 @@
+"""Tests for the adaptive rate limiter in tap_successfactors.ratelimit."""
+
+import time
+
+import requests
+
+from tap_successfactors.ratelimit import (
+    INCREASE_STEP,
+    AdaptiveRateLimiter,
+    parse_retry_after,
+)
+
+
+def response(status_code, retry_after=None):
+    result = requests.Response()
+    result.status_code = status_code
+    if retry_after is not None:
+        result.headers["Retry-After"] = retry_after
+    return result
+
+
+def elapsed(func):
+    started = time.monotonic()
+    func()
+    return time.monotonic() - started
+
+
+def test_requests_are_not_limited_until_throttled():
+    limiter = AdaptiveRateLimiter()
+
+    assert elapsed(lambda: [limiter.acquire() for _ in range(500)]) < 0.5
+    for _ in range(10):
+        limiter.on_response(response(200))
+    assert limiter.rate is None
+
+
+def test_first_throttle_halves_the_observed_rate_then_probes_upwards():
+    limiter = AdaptiveRateLimiter()
+    for _ in range(40):
+        limiter.acquire()
+
+    limiter.on_response(response(429))
+    assert limiter.rate == 20
+    limiter.on_response(response(200))
+    assert limiter.rate == 20 + 40 * INCREASE_STEP
+    limiter.on_response(response(429))
+    assert limiter.rate == (20 + 40 * INCREASE_STEP) / 2
+    # Server errors leave the rate alone.
+    limiter.on_response(response(503))
+    assert limiter.rate == (20 + 40 * INCREASE_STEP) / 2
+
+
+def test_configured_rate_is_a_ceiling():
+    limiter = AdaptiveRateLimiter(max_rate=20)
+
+    assert elapsed(lambda: [limiter.acquire() for _ in range(6)]) >= 0.2
+    limiter.on_response(response(429))
+    assert limiter.rate == 10
+    for _ in range(100):
+        limiter.on_response(response(200))
+    assert limiter.rate == 20
+
+
+def test_retry_after_pauses_every_caller():
+    limiter = AdaptiveRateLimiter()
+    limiter.on_response(response(429, retry_after="0.3"))
+
+    assert elapsed(limiter.acquire) >= 0.25
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,68 @@
+"""Tests for tap-level behaviour of TapSuccessfactors."""
+
+from conftest import bookmarks, capture_messages, make_tap, records
+from mock_server import MockData
+
+from tap_successfactors.tap import TapSuccessfactors
+
+CONFIG = {
+    "base_url": "https://example.invalid",
+    "client_id": "test",
+    "client_secret": "test",
+    "user_id": "test",
+    "company_id": "test",
+    "language": "English",
+    "target_user_id": "test",
+}
+
+
+def test_only_catalogs_is_selected_without_a_catalog():
+    tap = TapSuccessfactors(config=CONFIG, parse_env_config=False)
+
+    selected = [name for name, stream in tap.streams.items() if stream.selected]
+
+    assert selected == ["catalogs"]
+
+
+def test_parallel_streams_sync_the_same_records_and_state(mock_server):
+    server = mock_server(MockData(catalogs=4, courses=20, history=300))
+    select = [
+        "catalogs_list",
+        "catalogs_courses_feed",
+        "scheduled_offerings",
+        "learning_historys",
+    ]
+    config = {"learning_history_window_days": 365, "max_workers": 4}
+
+    sequential = capture_messages(make_tap(server, config, select=select).sync_all)
+    parallel = capture_messages(
+        make_tap(server, {**config, "parallel_streams": 2}, select=select).sync_all
+    )
+
+    for stream_name in select:
+        assert records(parallel, stream_name), stream_name
+        assert sorted(map(repr, records(parallel, stream_name))) == sorted(
+            map(repr, records(sequential, stream_name))
+        ), stream_name
+    final_state = [m for m in parallel if m["type"] == "STATE"][-1]["value"]
+    history_bookmark = final_state["bookmarks"]["learning_historys"]
+    sequential_bookmark = bookmarks(sequential, "learning_historys")[-1]
+    # Both bookmarks are the start of their run, which may differ by a second.
+    assert set(history_bookmark) == set(sequential_bookmark)
+    assert (
+        history_bookmark["user_bookmarks"]["test"]
+        >= sequential_bookmark["user_bookmarks"]["test"]
+    )
+    assert "progress_markers" not in repr(final_state)
+
+
+def test_discovery_does_not_read_the_target_user_ids_file(tmp_path):
+    config = {**CONFIG, "target_user_ids_file": str(tmp_path / "missing.txt")}
+
+    catalog = TapSuccessfactors(config=config, parse_env_config=False).catalog_dict
+
+    key_properties = {
+        entry["tap_stream_id"]: entry["key_properties"] for entry in catalog["streams"]
+    }
+    assert key_properties["learning_historys"] == ["componentID", "targetUserID"]
+    assert key_properties["user_todo_learning_items"] == ["sku", "targetUserID"]